@@ -18,6 +18,7 @@ API_BASE_URL = API_BASE_URL.rstrip("/")
 
 # DummyJSON endpoint
 ENDPOINT = "products"
+PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "100"))
 
 # =========================================================
 # API FETCH
@@ -25,7 +26,8 @@ ENDPOINT = "products"
 
 def fetch_api_data() -> list[dict]:
     """
-    Fetch raw product data from the API.
+    Fetch raw product data from the API, following skip/limit pages
+    until `total` products have been read.
     No normalization.
     No transformation.
     No embeddings.
@@ -36,16 +38,28 @@ def fetch_api_data() -> list[dict]:
     url = f"{API_BASE_URL}/{ENDPOINT}"
     print("Fetching API data from:", url)
 
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
+    products = []
+    with requests.Session() as session:
+        while True:
+            response = session.get(
+                url,
+                params={"skip": len(products), "limit": PAGE_SIZE},
+                timeout=30,
+            )
+            response.raise_for_status()
 
-    data = response.json()
+            data = response.json()
 
-    # DummyJSON structure: { products: [...], total, skip, limit }
-    products = data.get("products", [])
+            # DummyJSON structure: { products: [...], total, skip, limit }
+            page = data.get("products", [])
 
-    if not isinstance(products, list):
-        raise ValueError("API response format invalid: 'products' is not a list")
+            if not isinstance(page, list):
+                raise ValueError("API response format invalid: 'products' is not a list")
+
+            products.extend(page)
+
+            if not page or len(products) >= data.get("total", 0):
+                break
 
     return products
 
@@ -1,3 +1,6 @@
+# Standalone refresh loop for the DummyJSON prototype. Backend sources are
+# re-synced by `python manage.py sync_scheduler` using each ApiSource's
+# sync_interval_minutes.
 import time
 import os
 from embed_and_store import embed_and_store
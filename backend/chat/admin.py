@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ChatSession, ChatMessage
+from .models import ChatSession, ChatMessage, CachedAnswer
 
 
 @admin.register(ChatSession)
@@ -12,3 +12,10 @@ class ChatSessionAdmin(admin.ModelAdmin):
 class ChatMessageAdmin(admin.ModelAdmin):
     list_display = ("session", "role", "created_at")
     list_filter = ("role",)
+
+
+@admin.register(CachedAnswer)
+class CachedAnswerAdmin(admin.ModelAdmin):
+    list_display = ("question", "api_source", "top_k", "hit_count", "created_at")
+    search_fields = ("question",)
+    exclude = ("embedding",)
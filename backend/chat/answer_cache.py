@@ -0,0 +1,89 @@
+"""
+Answer Cache: reuse answers for near-identical questions against a source.
+
+Retrieval still runs for every question; only the LLM call is saved. A
+cached answer matches when its question embedding is within
+ANSWER_CACHE_THRESHOLD cosine similarity, it was produced from exactly the
+contexts just retrieved, with the same top_k and agent role, and the source
+has not been re-synced since. Matching on contexts keeps questions that
+differ only in an identifier ("price of SKU-1042" vs "SKU-1043") apart even
+when their embeddings are nearly identical. Entries are dropped whenever
+the source is ingested again.
+"""
+
+import hashlib
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import CachedAnswer
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def find_cached_answer(source, question_vector, top_k: int, contexts: list[str]) -> CachedAnswer | None:
+    if not settings.ANSWER_CACHE_ENABLED:
+        return None
+
+    context_hashes = [_hash(c) for c in contexts]
+
+    candidates = list(
+        CachedAnswer.objects.filter(
+            api_source=source,
+            top_k=top_k,
+            agent_role_hash=_hash(source.agent_role),
+            source_synced_at=source.last_synced,
+            created_at__gte=timezone.now() - timedelta(seconds=settings.ANSWER_CACHE_TTL),
+        )
+        .order_by("-created_at")
+        .only("id", "embedding", "context_hashes", "answer")[: settings.ANSWER_CACHE_MAX_PER_SOURCE]
+    )
+    candidates = [c for c in candidates if c.context_hashes == context_hashes]
+    if not candidates:
+        return None
+
+    # Stored and query vectors are L2-normalized, so the dot product is the cosine.
+    matrix = np.stack([np.frombuffer(c.embedding, dtype=np.float32) for c in candidates])
+    scores = matrix @ np.asarray(question_vector, dtype=np.float32)
+    best = int(np.argmax(scores))
+
+    if scores[best] < settings.ANSWER_CACHE_THRESHOLD:
+        return None
+
+    hit = candidates[best]
+    CachedAnswer.objects.filter(pk=hit.pk).update(hit_count=F("hit_count") + 1)
+    return hit
+
+
+def store_answer(source, question: str, question_vector, top_k: int, contexts: list[str], answer: str, sources: list[str]):
+    if not settings.ANSWER_CACHE_ENABLED:
+        return
+
+    CachedAnswer.objects.create(
+        api_source=source,
+        question=question,
+        embedding=np.asarray(question_vector, dtype=np.float32).tobytes(),
+        top_k=top_k,
+        agent_role_hash=_hash(source.agent_role),
+        context_hashes=[_hash(c) for c in contexts],
+        answer=answer,
+        sources=sources,
+        source_synced_at=source.last_synced,
+    )
+
+    stale_ids = list(
+        CachedAnswer.objects.filter(api_source=source)
+        .order_by("-created_at")
+        .values_list("id", flat=True)[settings.ANSWER_CACHE_MAX_PER_SOURCE :]
+    )
+    if stale_ids:
+        CachedAnswer.objects.filter(id__in=stale_ids).delete()
+
+
+def invalidate_source(source):
+    CachedAnswer.objects.filter(api_source=source).delete()
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0001_initial'),
+        ('sources', '0004_ingestjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CachedAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question', models.TextField()),
+                ('embedding', models.BinaryField()),
+                ('top_k', models.IntegerField()),
+                ('agent_role_hash', models.CharField(max_length=64)),
+                ('context_hashes', models.JSONField(blank=True, default=list)),
+                ('answer', models.TextField()),
+                ('sources', models.JSONField(blank=True, default=list)),
+                ('source_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('hit_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('api_source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cached_answers', to='sources.apisource')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
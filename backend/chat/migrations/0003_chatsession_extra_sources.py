@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_cachedanswer'),
+        ('sources', '0004_ingestjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatsession',
+            name='extra_sources',
+            field=models.ManyToManyField(blank=True, help_text='Additional sources searched together with api_source.', related_name='extra_chat_sessions', to='sources.apisource'),
+        ),
+    ]
@@ -4,10 +4,16 @@ from sources.models import ApiSource
 
 
 class ChatSession(models.Model):
-    """A chat session linked to a specific API source."""
+    """A chat session linked to a primary API source and optionally more."""
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="chat_sessions")
     api_source = models.ForeignKey(ApiSource, on_delete=models.CASCADE, related_name="chat_sessions")
+    extra_sources = models.ManyToManyField(
+        ApiSource,
+        blank=True,
+        related_name="extra_chat_sessions",
+        help_text="Additional sources searched together with api_source.",
+    )
     title = models.CharField(max_length=255, default="New Chat")
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -19,6 +25,11 @@ class ChatSession(models.Model):
     def __str__(self):
         return f"{self.title} - {self.user.email}"
 
+    def all_sources(self) -> list[ApiSource]:
+        """The primary source followed by any extra sources."""
+        extra = [s for s in self.extra_sources.all() if s.pk != self.api_source_id]
+        return [self.api_source, *extra]
+
 
 class ChatMessage(models.Model):
     """A message within a chat session."""
@@ -40,3 +51,27 @@ class ChatMessage(models.Model):
 
     def __str__(self):
         return f"[{self.role}] {self.content[:50]}..."
+
+
+class CachedAnswer(models.Model):
+    """A previous answer reused for semantically near-identical questions."""
+
+    api_source = models.ForeignKey(ApiSource, on_delete=models.CASCADE, related_name="cached_answers")
+    question = models.TextField()
+    embedding = models.BinaryField()
+    top_k = models.IntegerField()
+    agent_role_hash = models.CharField(max_length=64)
+    context_hashes = models.JSONField(default=list, blank=True)
+    answer = models.TextField()
+    sources = models.JSONField(default=list, blank=True)
+    # `api_source.last_synced` when the answer was produced.
+    source_synced_at = models.DateTimeField(null=True, blank=True)
+    hit_count = models.IntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.question[:50]} ({self.api_source.name})"
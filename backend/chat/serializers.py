@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from sources.models import ApiSource
 from .models import ChatSession, ChatMessage
 
 
@@ -11,12 +12,23 @@ class ChatMessageSerializer(serializers.ModelSerializer):
 
 class ChatSessionSerializer(serializers.ModelSerializer):
     api_source_name = serializers.CharField(source="api_source.name", read_only=True)
+    extra_sources = serializers.PrimaryKeyRelatedField(
+        many=True,
+        required=False,
+        queryset=ApiSource.objects.all(),
+    )
 
     class Meta:
         model = ChatSession
-        fields = ["id", "title", "api_source", "api_source_name", "created_at", "updated_at"]
+        fields = ["id", "title", "api_source", "api_source_name", "extra_sources", "created_at", "updated_at"]
         read_only_fields = ["id", "api_source_name", "created_at", "updated_at"]
 
+    def validate_extra_sources(self, value):
+        user = self.context["request"].user
+        if any(source.user_id != user.id for source in value):
+            raise serializers.ValidationError("API source not found.")
+        return value
+
     def create(self, validated_data):
         validated_data["user"] = self.context["request"].user
         return super().create(validated_data)
@@ -0,0 +1,10 @@
+from django.dispatch import receiver
+
+from sources.signals import source_ingested
+
+from .answer_cache import invalidate_source
+
+
+@receiver(source_ingested)
+def drop_cached_answers(sender, source, **kwargs):
+    invalidate_source(source)
@@ -6,4 +6,5 @@ urlpatterns = [
     path("sessions/<int:pk>/", views.session_detail, name="session-detail"),
     path("sessions/<int:pk>/messages/", views.session_messages, name="session-messages"),
     path("sessions/<int:pk>/query/", views.session_query, name="session-query"),
+    path("sessions/<int:pk>/query/stream/", views.session_query_stream, name="session-query-stream"),
 ]
@@ -1,12 +1,17 @@
+import json
+
+from django.http import StreamingHttpResponse
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.response import Response
 
 from .models import ChatSession, ChatMessage
 from .serializers import ChatSessionSerializer, ChatMessageSerializer
 from sources.models import ApiSource
-from sources.rag_service import search_source, query_llm
+from sources.rag_service import search_sources, query_llm, stream_llm, embed_query
+from .answer_cache import find_cached_answer, store_answer
 
 
 # =========================================================
@@ -110,15 +115,27 @@ def session_messages(request, pk):
 # QUERY SESSION (RAG + LLM)
 # =========================================================
 
-@api_view(["POST"])
-@permission_classes([IsAuthenticated])
-def session_query(request, pk):
-    """Send a question and receive AI response."""
+def _parse_mmr_lambda(value) -> float | None:
+    """Optional MMR trade-off from the request; raises ValueError if out of range."""
+    if value in (None, ""):
+        return None
+    value = float(value)
+    if not 0 <= value <= 1:
+        raise ValueError(value)
+    return value
+
+
+def _prepare_query(request, pk):
+    """
+    Validate a query request and save the user's message.
 
+    Returns ``(query, None)`` with the parsed query, or ``(None, response)``
+    with the error response to send.
+    """
     try:
         session = ChatSession.objects.get(pk=pk, user=request.user)
     except ChatSession.DoesNotExist:
-        return Response(
+        return None, Response(
             {"error": "Session not found"},
             status=status.HTTP_404_NOT_FOUND
         )
@@ -127,11 +144,19 @@ def session_query(request, pk):
     top_k = int(request.data.get("top_k", 5))
 
     if not question:
-        return Response(
+        return None, Response(
             {"error": "Question is required"},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    try:
+        mmr_lambda = _parse_mmr_lambda(request.data.get("mmr_lambda"))
+    except (TypeError, ValueError):
+        return None, Response(
+            {"error": "mmr_lambda must be a number between 0 and 1"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     # Save user message
     ChatMessage.objects.create(
         session=session,
@@ -139,45 +164,179 @@ def session_query(request, pk):
         content=question,
     )
 
-    try:
-        source = session.api_source
+    return {
+        "session": session,
+        "question": question,
+        "top_k": top_k,
+        "mmr_lambda": mmr_lambda,
+    }, None
+
+
+class _Retrieval:
+    """
+    Contexts retrieved for a query.
+
+    ``answer`` is already set when no LLM call is needed: nothing relevant
+    was found, or the answer cache holds an answer built from the same
+    contexts.
+    """
+
+    def __init__(self, session, question: str, top_k: int, mmr_lambda: float | None):
+        self.source = session.api_source
+        self.question = question
+        self.top_k = top_k
+        sources = session.all_sources()
+        self.question_vector = embed_query(question)
 
         # 🔍 Search vector DB
-        results = search_source(source, question, top_k=top_k)
+        results = search_sources(sources, question, top_k=top_k, mmr_lambda=mmr_lambda)
+        self.contexts = results.get("contexts", [])
+        self.sources_used = results.get("sources", [])
+
+        # Cached answers are per source and built without MMR; other
+        # queries always ask the LLM.
+        self.use_cache = len(sources) == 1 and mmr_lambda is None
+
+        self.answer = None
+        if not self.contexts:
+            self.answer = "I couldn't find relevant information in your indexed data."
+        elif self.use_cache:
+            cached = find_cached_answer(self.source, self.question_vector, top_k, self.contexts)
+            if cached is not None:
+                self.answer = cached.answer
+
+    def remember(self, answer: str):
+        """Cache an answer the LLM produced from these contexts."""
+        if self.use_cache:
+            store_answer(
+                self.source,
+                self.question,
+                self.question_vector,
+                self.top_k,
+                self.contexts,
+                answer,
+                self.sources_used,
+            )
+
+
+def _save_answer(session, question: str, answer: str, sources_used: list) -> ChatMessage:
+    """Save the assistant message and title the session after its first question."""
+    assistant_msg = ChatMessage.objects.create(
+        session=session,
+        role="assistant",
+        content=answer,
+        sources=sources_used,
+    )
+
+    # Update title on first user message
+    if session.messages.filter(role="user").count() == 1:
+        session.title = question[:100]
+        session.save()
+
+    return assistant_msg
+
+
+def _save_error(session, error: Exception) -> ChatMessage:
+    return ChatMessage.objects.create(
+        session=session,
+        role="assistant",
+        content=f"Error: {str(error)}",
+    )
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def session_query(request, pk):
+    """Send a question and receive AI response."""
 
-        contexts = results.get("contexts", [])
-        sources_used = results.get("sources", [])
+    query, error_response = _prepare_query(request, pk)
+    if error_response is not None:
+        return error_response
+    session, question = query["session"], query["question"]
 
-        if not contexts:
-            answer = "I couldn't find relevant information in your indexed data."
-        else:
+    try:
+        retrieval = _Retrieval(session, question, query["top_k"], query["mmr_lambda"])
+
+        answer = retrieval.answer
+        if answer is None:
             # 🤖 Query LLM
-            answer = query_llm(question, contexts, agent_role=source.agent_role)
-
-        # Save assistant message
-        assistant_msg = ChatMessage.objects.create(
-            session=session,
-            role="assistant",
-            content=answer,
-            sources=sources_used,
-        )
+            answer = query_llm(question, retrieval.contexts, agent_role=retrieval.source.agent_role)
+            retrieval.remember(answer)
 
-        # Update title on first user message
-        if session.messages.filter(role="user").count() == 1:
-            session.title = question[:100]
-            session.save()
+        assistant_msg = _save_answer(session, question, answer, retrieval.sources_used)
 
         serializer = ChatMessageSerializer(assistant_msg)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     except Exception as e:
-        error_message = f"Error: {str(e)}"
+        serializer = ChatMessageSerializer(_save_error(session, e))
+        return Response(serializer.data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        error_msg = ChatMessage.objects.create(
-            session=session,
-            role="assistant",
-            content=error_message,
-        )
 
-        serializer = ChatMessageSerializer(error_msg)
-        return Response(serializer.data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+# =========================================================
+# QUERY SESSION (STREAMING)
+# =========================================================
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets clients negotiate ``text/event-stream`` (EventSource always asks
+    for it). Errors returned before streaming starts go out as one
+    ``error`` event.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return _sse("error", data).encode(self.charset)
+
+
+@api_view(["POST"])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+@permission_classes([IsAuthenticated])
+def session_query_stream(request, pk):
+    """
+    Send a question and stream the AI response as Server-Sent Events.
+
+    Emits `token` events with `{"delta": ...}` as the answer is generated,
+    then a `done` event carrying the saved assistant message. If the client
+    disconnects, the upstream LLM request is cancelled and nothing is saved.
+    """
+
+    query, error_response = _prepare_query(request, pk)
+    if error_response is not None:
+        return error_response
+    session, question = query["session"], query["question"]
+
+    def events():
+        try:
+            retrieval = _Retrieval(session, question, query["top_k"], query["mmr_lambda"])
+
+            answer = retrieval.answer
+            if answer is not None:
+                yield _sse("token", {"delta": answer})
+            else:
+                parts = []
+                for delta in stream_llm(question, retrieval.contexts, agent_role=retrieval.source.agent_role):
+                    parts.append(delta)
+                    yield _sse("token", {"delta": delta})
+                answer = "".join(parts).strip()
+                retrieval.remember(answer)
+
+            assistant_msg = _save_answer(session, question, answer, retrieval.sources_used)
+            yield _sse("done", ChatMessageSerializer(assistant_msg).data)
+
+        except Exception as e:
+            yield _sse("error", ChatMessageSerializer(_save_error(session, e)).data)
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -149,11 +149,142 @@ GOOGLE_REDIRECT_URI = os.getenv(
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY", "")
+# Seconds a positive collection-existence check is trusted in-process.
+QDRANT_EXISTS_CACHE_TTL = float(os.getenv("QDRANT_EXISTS_CACHE_TTL", "30"))
+# "per_source": one collection per ApiSource. "shared": all sources in
+# QDRANT_SHARED_COLLECTION (split over QDRANT_SHARED_SHARDS collections by
+# user id), filtered by payload. Move existing data with
+# `manage.py migrate_to_shared_collection` before switching.
+QDRANT_STORAGE_MODE = os.getenv("QDRANT_STORAGE_MODE", "per_source")
+QDRANT_SHARED_COLLECTION = os.getenv("QDRANT_SHARED_COLLECTION", "rag_sources")
+QDRANT_SHARED_SHARDS = int(os.getenv("QDRANT_SHARED_SHARDS", "1"))
+# Vector quantization for new collections: "none", "scalar" (int8) or
+# "binary". Sources can override it. Quantized searches fetch
+# QDRANT_QUANTIZATION_OVERSAMPLING times more candidates and rescore them
+# with the original vectors, which stay on disk with QDRANT_VECTORS_ON_DISK.
+QDRANT_QUANTIZATION = os.getenv("QDRANT_QUANTIZATION", "none")
+QDRANT_SCALAR_QUANTILE = float(os.getenv("QDRANT_SCALAR_QUANTILE", "0.99"))
+QDRANT_QUANTIZATION_OVERSAMPLING = float(os.getenv("QDRANT_QUANTIZATION_OVERSAMPLING", "2.0"))
+QDRANT_VECTORS_ON_DISK = os.getenv("QDRANT_VECTORS_ON_DISK", "True").lower() == "true"
+# HNSW defaults for new collections and searches; sources can override
+# them. Unset keeps Qdrant's defaults.
+QDRANT_HNSW_M = int(os.getenv("QDRANT_HNSW_M") or 0) or None
+QDRANT_HNSW_EF_CONSTRUCT = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT") or 0) or None
+QDRANT_SEARCH_EF = int(os.getenv("QDRANT_SEARCH_EF") or 0) or None
+# Sources with at most this many points are searched exactly (no HNSW).
+QDRANT_EXACT_SEARCH_MAX_POINTS = int(os.getenv("QDRANT_EXACT_SEARCH_MAX_POINTS", "2000"))
+# Full rebuilds upload with indexing disabled and build the index once at
+# the end, with QDRANT_INDEXING_THRESHOLD (KB) restored afterwards. The
+# alias is only swapped once Qdrant has finished optimizing the new version
+# (or after QDRANT_INDEX_WAIT_TIMEOUT seconds), so the old version keeps serving.
+QDRANT_BULK_INGEST = os.getenv("QDRANT_BULK_INGEST", "True").lower() == "true"
+QDRANT_INDEXING_THRESHOLD = int(os.getenv("QDRANT_INDEXING_THRESHOLD", "20000"))
+QDRANT_INDEX_WAIT_TIMEOUT = float(os.getenv("QDRANT_INDEX_WAIT_TIMEOUT", "1800"))
+QDRANT_INDEX_POLL_INTERVAL = float(os.getenv("QDRANT_INDEX_POLL_INTERVAL", "2"))
 
 EMBED_MODEL_NAME = "all-MiniLM-L6-v2"
 EMBED_DIM = 384
+# Tokenizer and input limit of the embedding model, used by token-aware
+# chunking. Default chunk size/overlap (tokens) for sources that set none.
+EMBED_TOKENIZER_NAME = os.getenv("EMBED_TOKENIZER_NAME", "sentence-transformers/all-MiniLM-L6-v2")
+EMBED_MAX_TOKENS = 256
+CHUNK_DEFAULT_TOKENS = int(os.getenv("CHUNK_DEFAULT_TOKENS", "224"))
+CHUNK_DEFAULT_OVERLAP_TOKENS = int(os.getenv("CHUNK_DEFAULT_OVERLAP_TOKENS", "32"))
+
+# When set (e.g. http://127.0.0.1:8765), embeddings come from the shared
+# `manage.py embed_server` process instead of a per-process model.
+EMBED_SERVER_URL = os.getenv("EMBED_SERVER_URL", "")
+EMBED_SERVER_MAX_BATCH = int(os.getenv("EMBED_SERVER_MAX_BATCH", "64"))
+EMBED_SERVER_MAX_WAIT_MS = float(os.getenv("EMBED_SERVER_MAX_WAIT_MS", "5"))
+
+# On-disk embedding cache keyed by (model, text hash). Empty path disables it.
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", str(BASE_DIR / "embedding_cache.sqlite3"))
+EMBED_CACHE_MAX_ENTRIES = int(os.getenv("EMBED_CACHE_MAX_ENTRIES", "1000000"))
+
+# In-process LRU of question -> query vector used by search_source. With
+# QUERY_CACHE_USE_DJANGO_CACHE, Django's cache backend is a shared second level.
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "2048"))
+QUERY_CACHE_TTL = int(os.getenv("QUERY_CACHE_TTL", "3600"))
+QUERY_CACHE_USE_DJANGO_CACHE = os.getenv("QUERY_CACHE_USE_DJANGO_CACHE", "False").lower() == "true"
+
+# Semantic answer cache for chat queries: skip the LLM call when a new
+# question is at least this cosine-similar to a cached one for the same
+# source and retrieval returned exactly the same contexts.
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "True").lower() == "true"
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", "86400"))
+ANSWER_CACHE_MAX_PER_SOURCE = int(os.getenv("ANSWER_CACHE_MAX_PER_SOURCE", "500"))
+
+# Hybrid retrieval: per-source BM25 indexes live in LEXICAL_INDEX_DIR. Each
+# side fetches top_k * HYBRID_CANDIDATE_FACTOR hits before rank fusion.
+LEXICAL_INDEX_DIR = os.getenv("LEXICAL_INDEX_DIR", str(BASE_DIR / "lexical_indexes"))
+HYBRID_CANDIDATE_FACTOR = int(os.getenv("HYBRID_CANDIDATE_FACTOR", "4"))
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+
+# Optional cross-encoder rerank of search hits: fetch top_k * RERANK_FETCH_FACTOR
+# candidates, keep the best top_k. Reranking is skipped once it runs past
+# RERANK_BUDGET_MS and the vector order is used instead.
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "False").lower() == "true"
+RERANK_MODEL_NAME = os.getenv("RERANK_MODEL_NAME", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+RERANK_FETCH_FACTOR = int(os.getenv("RERANK_FETCH_FACTOR", "4"))
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "16"))
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "300"))
+
+# Chat queries with `mmr_lambda` fetch MMR_FETCH_FACTOR times more candidates
+# (with vectors) and pick a diverse top_k by Maximal Marginal Relevance.
+MMR_FETCH_FACTOR = int(os.getenv("MMR_FETCH_FACTOR", "4"))
+
+# Retrieved contexts are stitched, deduplicated (word-shingle Jaccard at or
+# above CONTEXT_DEDUP_THRESHOLD) and packed into CONTEXT_TOKEN_BUDGET tokens,
+# counted with CONTEXT_TOKENIZER_NAME (empty: estimate 4 chars per token).
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+CONTEXT_DEDUP_THRESHOLD = float(os.getenv("CONTEXT_DEDUP_THRESHOLD", "0.85"))
+CONTEXT_TOKENIZER_NAME = os.getenv("CONTEXT_TOKENIZER_NAME", "sentence-transformers/all-MiniLM-L6-v2")
+
+# Threads shared by multi-source chat sessions for concurrent per-source search.
+SEARCH_MAX_PARALLEL = int(os.getenv("SEARCH_MAX_PARALLEL", "8"))
 
 LLM_MODEL = os.getenv("LLM_MODEL", "llama-3.3-70b-versatile")
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://api.groq.com/openai/v1")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "20"))
+LLM_KEEPALIVE_SECONDS = float(os.getenv("LLM_KEEPALIVE_SECONDS", "60"))
+
+# =========================================================
+# INGEST WORKER
+# =========================================================
+
+# Threads per `manage.py ingest_worker` process.
+INGEST_WORKER_CONCURRENCY = int(os.getenv("INGEST_WORKER_CONCURRENCY", "2"))
+# Max jobs running at once for a single user, across all workers.
+INGEST_MAX_JOBS_PER_USER = int(os.getenv("INGEST_MAX_JOBS_PER_USER", "1"))
+INGEST_POLL_INTERVAL = float(os.getenv("INGEST_POLL_INTERVAL", "2"))
+# Running jobs without a heartbeat for this long are requeued.
+INGEST_JOB_STALE_SECONDS = int(os.getenv("INGEST_JOB_STALE_SECONDS", "900"))
+# `manage.py sync_scheduler`: how often to look for due sources, the most
+# queued+running jobs it will add to, and +/- fraction of a source's
+# interval used to jitter its next run.
+SYNC_SCHEDULER_POLL_INTERVAL = float(os.getenv("SYNC_SCHEDULER_POLL_INTERVAL", "30"))
+SYNC_SCHEDULER_MAX_ACTIVE_JOBS = int(os.getenv("SYNC_SCHEDULER_MAX_ACTIVE_JOBS", "20"))
+SYNC_SCHEDULER_JITTER = float(os.getenv("SYNC_SCHEDULER_JITTER", "0.1"))
+# Items embedded and upserted per batch, and upsert batches allowed in
+# flight while the next batch is embedded.
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "128"))
+INGEST_MAX_INFLIGHT_BATCHES = int(os.getenv("INGEST_MAX_INFLIGHT_BATCHES", "2"))
+# API fetching: pages fetched ahead concurrently for offset/page pagination,
+# pooled connections, retries with exponential backoff on 429/5xx, and the
+# default request rate per source fetch (0 = unlimited).
+API_FETCH_CONCURRENCY = int(os.getenv("API_FETCH_CONCURRENCY", "4"))
+API_FETCH_POOL_SIZE = int(os.getenv("API_FETCH_POOL_SIZE", "16"))
+API_FETCH_TIMEOUT = float(os.getenv("API_FETCH_TIMEOUT", "60"))
+API_FETCH_MAX_RETRIES = int(os.getenv("API_FETCH_MAX_RETRIES", "5"))
+API_FETCH_BACKOFF = float(os.getenv("API_FETCH_BACKOFF", "0.5"))
+API_FETCH_REQUESTS_PER_SECOND = float(os.getenv("API_FETCH_REQUESTS_PER_SECOND", "10"))
+# Processes used to extract PDF page text (1 extracts in the ingest thread),
+# and pages handed to a process at a time.
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(os.cpu_count() or 1, 8))))
+PDF_EXTRACT_PAGES_PER_TASK = int(os.getenv("PDF_EXTRACT_PAGES_PER_TASK", "16"))
 
 # =========================================================
 # REST FRAMEWORK
@@ -1,9 +1,16 @@
 from django.contrib import admin
-from .models import ApiSource
+from .models import ApiSource, IngestJob
 
 
 @admin.register(ApiSource)
 class ApiSourceAdmin(admin.ModelAdmin):
-    list_display = ("name", "user", "status", "document_count", "last_synced", "created_at")
+    list_display = ("name", "user", "status", "document_count", "last_synced", "next_sync_at", "created_at")
     list_filter = ("status",)
     search_fields = ("name", "api_url", "user__email")
+
+
+@admin.register(IngestJob)
+class IngestJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "source", "user", "kind", "status", "stage", "progress", "total", "duration_seconds", "created_at")
+    list_filter = ("status", "kind")
+    search_fields = ("source__name", "user__email")
@@ -0,0 +1,454 @@
+"""
+API Fetch: paginated, concurrent fetching of items from a source's API.
+
+A source's ``pagination`` config picks how pages are addressed:
+
+- ``{}`` or ``{"type": "none"}``: one request returns everything.
+- ``offset``: ``offset_param`` / ``limit_param`` query parameters
+  (defaults ``offset`` / ``limit``), ``page_size`` items per page.
+- ``page``: ``page_param`` (default ``page``) starting at ``start_page``
+  (default 1), with optional ``size_param`` set to ``page_size``.
+- ``cursor``: the response field at ``cursor_path`` is sent back as
+  ``cursor_param`` until it is empty.
+- ``next_link``: follow the URL at ``next_path`` in the body, or the
+  ``Link: rel="next"`` header.
+
+Offset and page pagination fetch up to API_FETCH_CONCURRENCY pages ahead
+at once and stop at the first short page, or at ``total_path`` when the
+API reports a total. Cursor and next-link pages depend on the previous
+response and are fetched one at a time.
+
+``response_format`` controls how a page body is read. ``json`` parses it
+whole. ``json_stream`` reads the body incrementally with ijson and yields
+the array at ``data_path`` one item at a time, so a huge export never sits
+in memory whole. ``ndjson`` yields one item per line. All requests share a pooled
+session that retries 429/5xx with exponential backoff, and go through a
+per-fetch rate limiter (``requests_per_second``).
+
+Delta syncs pass the ``state`` saved by the previous fetch. For
+unpaginated sources the request then carries ``If-None-Match`` /
+``If-Modified-Since``, and ``probe()`` reports a 304 before any items are
+read. Paginated sources never send validators: the first page's ETag says
+nothing about later pages. With ``since_param`` set, the newest
+``since_field`` value seen last time is sent as that query parameter, so
+the API only returns records changed since then.
+"""
+
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+PAGINATION_TYPES = ("none", "offset", "page", "cursor", "next_link")
+RESPONSE_FORMATS = ("json", "json_stream", "ndjson")
+
+
+# =========================================================
+# SESSION
+# =========================================================
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Process-wide session with a connection pool and retry/backoff policy."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=settings.API_FETCH_MAX_RETRIES,
+                backoff_factor=settings.API_FETCH_BACKOFF,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+                respect_retry_after_header=True,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=settings.API_FETCH_POOL_SIZE,
+                pool_maxsize=settings.API_FETCH_POOL_SIZE,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+    return _session
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / per_second`` seconds apart across threads."""
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# =========================================================
+# RESPONSE HELPERS
+# =========================================================
+
+def resolve_path(data, path: str):
+    """Walk a dotted ``path`` into ``data``; None when any key is missing."""
+    for key in path.split("."):
+        key = key.strip()
+        if isinstance(data, dict) and key in data:
+            data = data[key]
+        else:
+            return None
+    return data
+
+
+def extract_items(data, data_path: str = "") -> list:
+    """The list of items at ``data_path``; a single object becomes a list."""
+    if data_path:
+        data = resolve_path(data, data_path)
+        if data is None:
+            raise ValueError(f"Path '{data_path}' not found in API response")
+
+    # Ensure list
+    if isinstance(data, dict):
+        data = [data]
+
+    if not isinstance(data, list):
+        raise ValueError("API response is not a list or object")
+
+    return data
+
+
+def iter_json_stream(fp, data_path: str = "", meta_paths=(), meta: dict = None):
+    """
+    Yield the elements of the array at ``data_path`` while parsing ``fp``.
+
+    Scalars found at any of ``meta_paths`` (e.g. a total or a next cursor)
+    are stored in ``meta`` as they are read; values after the array are
+    only there once the generator is exhausted.
+    """
+    import ijson
+
+    item_prefix = f"{data_path}.item" if data_path else "item"
+    meta_paths = set(meta_paths)
+    builder = None
+
+    for prefix, event, value in ijson.parse(fp, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == item_prefix and event in ("end_map", "end_array"):
+                yield builder.value
+                builder = None
+        elif prefix == item_prefix:
+            if event in ("start_map", "start_array"):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            else:
+                yield value
+        elif meta is not None and prefix in meta_paths:
+            meta[prefix] = value
+
+
+def iter_ndjson(response: requests.Response):
+    for line in response.iter_lines():
+        if line.strip():
+            yield json.loads(line)
+
+
+# =========================================================
+# FETCHING
+# =========================================================
+
+def _later(a, b):
+    """The later of two watermark values; mixed types compare as strings."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if type(a) is not type(b):
+        a, b = str(a), str(b)
+    return max(a, b)
+
+
+class ApiFetcher:
+    """Fetch every item of one API, page by page, in order."""
+
+    def __init__(
+        self,
+        api_url: str,
+        api_key: str = "",
+        headers: dict = None,
+        data_path: str = "",
+        pagination: dict = None,
+        since_param: str = "",
+        since_field: str = "",
+        state: dict = None,
+        response_format: str = "json",
+    ):
+        if response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"Unknown response format '{response_format}'")
+        self.response_format = response_format
+        self.api_url = api_url
+        self.data_path = data_path
+        self.pagination = pagination or {}
+        self.kind = self.pagination.get("type", "none")
+        if self.kind not in PAGINATION_TYPES:
+            raise ValueError(f"Unknown pagination type '{self.kind}'")
+        # Zero would never end offset/page iteration.
+        for key in ("page_size", "max_pages"):
+            if key in self.pagination and int(self.pagination[key]) < 1:
+                raise ValueError(f"Pagination {key} must be positive")
+
+        self.headers = dict(headers or {})
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+
+        self.session = get_session()
+        self.limiter = RateLimiter(
+            self.pagination.get("requests_per_second", settings.API_FETCH_REQUESTS_PER_SECOND)
+        )
+
+        state = state or {}
+        # Validators are only meaningful when one response is the whole dataset.
+        self.conditional_headers = {}
+        if self.kind == "none":
+            if state.get("etag"):
+                self.conditional_headers["If-None-Match"] = state["etag"]
+            if state.get("last_modified"):
+                self.conditional_headers["If-Modified-Since"] = state["last_modified"]
+
+        self.since_field = since_field
+        self.since = state.get("since") if since_param and since_field else None
+        self.base_params = {since_param: self.since} if self.since is not None else {}
+
+        # Validators and watermark collected while fetching.
+        self.etag = ""
+        self.last_modified = ""
+        self.watermark = self.since
+        self._probe_response = None
+
+    @property
+    def is_delta(self) -> bool:
+        """True when only records changed since the last fetch are requested."""
+        return self.since is not None
+
+    def new_state(self) -> dict:
+        """State to store for the next delta fetch."""
+        return {
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "since": self.watermark,
+        }
+
+    def _get(self, url: str, params: dict = None, first: bool = False) -> requests.Response:
+        if first and self._probe_response is not None:
+            response, self._probe_response = self._probe_response, None
+            return response
+
+        # Next links already carry their own query string.
+        if url == self.api_url:
+            params = {**self.base_params, **(params or {})}
+
+        self.limiter.wait()
+        response = self.session.get(
+            url,
+            params=params,
+            headers={**self.headers, **self.conditional_headers} if first else self.headers,
+            timeout=settings.API_FETCH_TIMEOUT,
+            stream=self.response_format != "json",
+        )
+        response.raise_for_status()
+        if first and self.kind == "none":
+            self.etag = response.headers.get("ETag", "")
+            self.last_modified = response.headers.get("Last-Modified", "")
+        return response
+
+    def _first_request(self) -> tuple[str, dict]:
+        if self.kind in ("offset", "page"):
+            return self.api_url, self._page_params(0)
+        return self.api_url, self._size_params()
+
+    def probe(self) -> bool:
+        """
+        Send the first request now; False if the server answered 304.
+
+        Only unpaginated sources send validators, so only they can be
+        skipped. The response is kept and reused as the first page when
+        iterating.
+        """
+        url, params = self._first_request()
+        response = self._get(url, params, first=True)
+        if response.status_code == 304 and self.kind == "none":
+            response.close()
+            return False
+        self._probe_response = response
+        return True
+
+    def _read_page(self, response: requests.Response, meta_paths=()) -> tuple:
+        """
+        Return ``(items, meta)`` for one response.
+
+        ``meta`` maps each of ``meta_paths`` to its value in the body. For
+        streamed formats ``items`` is lazy and ``meta`` is complete only
+        after ``items`` has been consumed.
+        """
+        meta_paths = [path for path in meta_paths if path]
+
+        if self.response_format == "json":
+            data = response.json()
+            return extract_items(data, self.data_path), {path: resolve_path(data, path) for path in meta_paths}
+
+        meta = {}
+        if self.response_format == "ndjson":
+            items = iter_ndjson(response)
+        else:
+            response.raw.decode_content = True
+            items = iter_json_stream(response.raw, self.data_path, meta_paths, meta)
+
+        def consume():
+            try:
+                yield from items
+            finally:
+                response.close()
+
+        return consume(), meta
+
+    def __iter__(self):
+        for item in self._iter_items():
+            if self.since_field and isinstance(item, dict):
+                self.watermark = _later(self.watermark, item.get(self.since_field))
+            yield item
+
+    def _iter_items(self):
+        if self.kind == "none":
+            url, params = self._first_request()
+            items, _ = self._read_page(self._get(url, params, first=True))
+            yield from items
+        elif self.kind in ("offset", "page"):
+            yield from self._iter_numbered()
+        elif self.kind == "cursor":
+            yield from self._iter_cursor()
+        else:
+            yield from self._iter_next_links()
+
+    def _size_params(self) -> dict:
+        p = self.pagination
+        return {p["size_param"]: int(p.get("page_size", 100))} if p.get("size_param") else {}
+
+    # -- offset / page ------------------------------------------------------
+
+    def _page_params(self, n: int) -> dict:
+        p = self.pagination
+        size = int(p.get("page_size", 100))
+        if self.kind == "offset":
+            return {
+                p.get("offset_param", "offset"): n * size,
+                p.get("limit_param", "limit"): size,
+            }
+        return {p.get("page_param", "page"): int(p.get("start_page", 1)) + n, **self._size_params()}
+
+    def _fetch_page(self, n: int):
+        total_path = self.pagination.get("total_path", "")
+        response = self._get(self.api_url, params=self._page_params(n), first=n == 0)
+        items, meta = self._read_page(response, [total_path])
+        # A page is at most page_size items; hold it so pages can be fetched ahead.
+        items = list(items)
+        return items, meta.get(total_path)
+
+    def _iter_numbered(self):
+        size = int(self.pagination.get("page_size", 100))
+        max_pages = self.pagination.get("max_pages")
+        last_page = int(max_pages) - 1 if max_pages else None
+        window = settings.API_FETCH_CONCURRENCY
+
+        pending = deque()  # (page number, future), in page order
+        next_page = 0
+
+        with ThreadPoolExecutor(max_workers=window, thread_name_prefix="api-fetch") as pool:
+            try:
+                while True:
+                    while len(pending) < window and (last_page is None or next_page <= last_page):
+                        pending.append((next_page, pool.submit(self._fetch_page, next_page)))
+                        next_page += 1
+                    if not pending:
+                        return
+
+                    _, future = pending.popleft()
+                    items, total = future.result()
+                    yield from items
+
+                    if len(items) < size:
+                        return
+                    if total is not None:
+                        pages = -(-int(total) // size)
+                        last_page = pages - 1 if last_page is None else min(last_page, pages - 1)
+                        # Pages already scheduled past the end are not needed.
+                        while pending and pending[-1][0] > last_page:
+                            pending.pop()[1].cancel()
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    # -- cursor / next link -------------------------------------------------
+
+    def _iter_cursor(self):
+        p = self.pagination
+        cursor_param = p.get("cursor_param", "cursor")
+        cursor_path = p.get("cursor_path", "next_cursor")
+        _, params = self._first_request()
+
+        for n in self._page_budget():
+            response = self._get(self.api_url, params=params, first=n == 0)
+            items, meta = self._read_page(response, [cursor_path])
+            yield from items
+
+            cursor = meta.get(cursor_path)
+            if not cursor:
+                return
+            params = {**params, cursor_param: cursor}
+
+    def _iter_next_links(self):
+        next_path = self.pagination.get("next_path", "")
+        url, params = self._first_request()
+
+        for n in self._page_budget():
+            response = self._get(url, params if n == 0 else None, first=n == 0)
+            items, meta = self._read_page(response, [next_path])
+            yield from items
+
+            url = meta.get(next_path) or response.links.get("next", {}).get("url")
+            if not url:
+                return
+
+    def _page_budget(self):
+        max_pages = self.pagination.get("max_pages")
+        return range(int(max_pages)) if max_pages else itertools.count()
+
+
+def fetcher_for_source(source, delta: bool = False) -> ApiFetcher:
+    """Fetcher for an API source; with ``delta``, conditional on its saved state."""
+    return ApiFetcher(
+        api_url=source.api_url,
+        api_key=source.api_key,
+        headers=source.headers,
+        data_path=source.data_path,
+        pagination=source.pagination,
+        since_param=source.since_param,
+        since_field=source.since_field,
+        state=source.fetch_state if delta else None,
+        response_format=source.response_format,
+    )
@@ -0,0 +1,161 @@
+"""
+Chunking: split page or item text into embedding-sized pieces.
+
+Strategies:
+- ``char``: fixed character windows with character overlap (the original
+  PDF behaviour).
+- ``token``: windows of the embedding model's tokens, cut on token
+  boundaries of the original text.
+- ``sentence``: whole sentences packed up to the token limit.
+- ``recursive``: paragraphs, then lines, then sentences, then words, split
+  only as far as needed to fit, then packed up to the token limit.
+
+Token strategies measure with the embedding model's tokenizer, so chunks
+never run past the model's input limit and get silently truncated.
+Overlap is carried over as whole units (sentences, lines) where possible.
+"""
+
+import re
+
+STRATEGIES = ("char", "token", "sentence", "recursive")
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+# (separator, text used to re-join pieces split on it)
+_RECURSIVE_SEPARATORS = (
+    (re.compile(r"\n\s*\n"), "\n\n"),
+    (re.compile(r"\n"), "\n"),
+    (_SENTENCE_RE, " "),
+    (re.compile(r" "), " "),
+)
+
+
+class Chunker:
+    """
+    Split text with one strategy.
+
+    ``chunk_size`` and ``overlap`` are characters for ``char`` and tokens
+    otherwise. Token strategies need a Hugging Face fast ``tokenizer``.
+    """
+
+    def __init__(self, strategy: str, chunk_size: int, overlap: int, tokenizer=None):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown chunk strategy '{strategy}'")
+        if strategy != "char" and tokenizer is None:
+            raise ValueError(f"Chunk strategy '{strategy}' needs a tokenizer")
+        if chunk_size <= 0 or not 0 <= overlap < chunk_size:
+            raise ValueError("Chunk size must be positive and larger than the overlap")
+
+        self.strategy = strategy
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.tokenizer = tokenizer
+
+    def split(self, text: str) -> list[str]:
+        text = text.strip()
+        if not text:
+            return []
+        if self.strategy == "char":
+            return self._char_windows(text)
+        if self.strategy == "token":
+            return self._token_windows(text)
+        if self.strategy == "sentence":
+            return self._pack(self._fit([text], ((_SENTENCE_RE, " "),)))
+        return self._pack(self._fit([text], _RECURSIVE_SEPARATORS))
+
+    # -- measuring ----------------------------------------------------------
+
+    def _tokens(self, text: str) -> int:
+        return len(self.tokenizer(text, add_special_tokens=False)["input_ids"])
+
+    # -- strategies ---------------------------------------------------------
+
+    def _char_windows(self, text: str) -> list[str]:
+        chunks = []
+        start = 0
+        while start < len(text):
+            end = min(start + self.chunk_size, len(text))
+            chunk = text[start:end].strip()
+            if chunk:
+                chunks.append(chunk)
+            if end == len(text):
+                break
+            start = end - self.overlap
+        return chunks
+
+    def _token_windows(self, text: str) -> list[str]:
+        offsets = self.tokenizer(
+            text,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+        )["offset_mapping"]
+        if not offsets:
+            return [text]
+
+        chunks = []
+        step = self.chunk_size - self.overlap
+        for start in range(0, len(offsets), step):
+            end = min(start + self.chunk_size, len(offsets))
+            chunk = text[offsets[start][0] : offsets[end - 1][1]].strip()
+            if chunk:
+                chunks.append(chunk)
+            if end == len(offsets):
+                break
+        return chunks
+
+    def _fit(self, pieces: list[str], separators, joiner: str = " ") -> list[tuple[str, int, str]]:
+        """
+        Split pieces with successive separators until each fits.
+
+        Returns ``(text, tokens, joiner)`` units, where ``joiner`` is the
+        text that separated the unit from the one before it.
+        """
+        fitted = []
+        for piece in pieces:
+            piece = piece.strip()
+            if not piece:
+                continue
+            tokens = self._tokens(piece)
+            if tokens <= self.chunk_size:
+                fitted.append((piece, tokens, joiner))
+            else:
+                if separators:
+                    pattern, inner = separators[0]
+                    parts = self._fit(pattern.split(piece), separators[1:], inner)
+                else:
+                    parts = [(w, self._tokens(w), " ") for w in self._token_windows(piece)]
+                # The first part is still separated from what came before by ``joiner``.
+                if parts:
+                    parts[0] = (parts[0][0], parts[0][1], joiner)
+                fitted.extend(parts)
+        return fitted
+
+    def _pack(self, units: list[tuple[str, int, str]]) -> list[str]:
+        """Greedily join units up to chunk_size tokens, repeating trailing units as overlap."""
+        chunks = []
+        current, size = [], 0
+
+        for unit in units:
+            tokens = unit[1]
+            if current and size + tokens > self.chunk_size:
+                chunks.append(_join(current))
+                carried, carried_size = [], 0
+                for prev in reversed(current):
+                    if carried_size + prev[1] > self.overlap or carried_size + prev[1] + tokens > self.chunk_size:
+                        break
+                    carried.insert(0, prev)
+                    carried_size += prev[1]
+                current, size = carried, carried_size
+            current.append(unit)
+            size += tokens
+
+        if current:
+            chunks.append(_join(current))
+        return chunks
+
+
+def _join(units: list[tuple[str, int, str]]) -> str:
+    parts = [units[0][0]]
+    for text, _, joiner in units[1:]:
+        parts.append(joiner)
+        parts.append(text)
+    return "".join(parts)
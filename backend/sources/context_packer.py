@@ -0,0 +1,134 @@
+"""
+Context Packer: turn ranked search hits into a compact list of LLM contexts.
+
+Neighbouring chunks of the same page or item (raw ids ending in
+``_chunk_<n>``) are stitched back together with their overlap removed,
+near-duplicate texts are dropped, and the survivors are added in rank order
+until a token budget is full.
+"""
+
+import re
+
+_CHUNK_RE = re.compile(r"^(?P<group>.*)_chunk_(?P<index>\d+)$")
+# Leading label repeated on every chunk of a group, e.g. "Page 12: ".
+_LABEL_RE = re.compile(r"^[^\n:]{1,40}: ")
+_WORD_RE = re.compile(r"\w+")
+
+# Longest chunk overlap looked for when stitching neighbours.
+MAX_OVERLAP_CHARS = 600
+# Shorter matches are coincidence ("...the" + "end..."), not carried-over
+# text; such neighbours are joined with a space instead.
+MIN_OVERLAP_CHARS = 20
+
+
+def _label(text: str) -> str:
+    match = _LABEL_RE.match(text)
+    return match.group(0) if match else ""
+
+
+def _stitch(left: str, right: str) -> str:
+    """Join two consecutive chunks, dropping the text they share."""
+    label = _label(left)
+    if label and right.startswith(label):
+        right = right[len(label):]
+
+    for size in range(min(len(left), len(right), MAX_OVERLAP_CHARS), MIN_OVERLAP_CHARS - 1, -1):
+        if left.endswith(right[:size]):
+            return left + right[size:]
+    return f"{left} {right}"
+
+
+def _merge_neighbours(hits: list) -> list[tuple[str, list]]:
+    """
+    Group hits into ``(text, members)`` in rank order.
+
+    Runs of consecutive chunks from one group collapse into a single entry,
+    ranked at the position of their best-ranked chunk.
+    """
+    groups = {}
+    order = []
+
+    for hit in hits:
+        payload = hit.payload or {}
+        match = _CHUNK_RE.match(str(payload.get("raw_id", "")))
+        if match is None:
+            order.append((None, hit))
+            continue
+        key = (payload.get("source_id"), match.group("group"))
+        if key not in groups:
+            groups[key] = []
+            order.append((key, None))
+        groups[key].append((int(match.group("index")), hit))
+
+    merged = []
+    for key, single in order:
+        if key is None:
+            merged.append(((single.payload or {}).get("text", ""), [single]))
+            continue
+
+        run_text, run_members, last = None, [], None
+        for index, hit in sorted(groups[key], key=lambda pair: pair[0]):
+            text = hit.payload.get("text", "")
+            if run_text is not None and index == last + 1:
+                run_text = _stitch(run_text, text)
+                run_members.append(hit)
+            else:
+                if run_text is not None:
+                    merged.append((run_text, run_members))
+                run_text, run_members = text, [hit]
+            last = index
+        merged.append((run_text, run_members))
+
+    rank = {id(hit): i for i, hit in enumerate(hits)}
+    merged.sort(key=lambda run: min(rank[id(h)] for h in run[1]))
+    return merged
+
+
+def _shingles(text: str) -> set:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < 3:
+        return {tuple(words)}
+    return {tuple(words[i : i + 3]) for i in range(len(words) - 2)}
+
+
+def _is_near_duplicate(shingles: set, kept: list[set], threshold: float) -> bool:
+    for other in kept:
+        union = len(shingles | other)
+        if union and len(shingles & other) / union >= threshold:
+            return True
+    return False
+
+
+def pack_contexts(hits: list, count_tokens, token_budget: int, dedup_threshold: float) -> tuple[list[str], list]:
+    """
+    Pack ranked ``hits`` into contexts within ``token_budget`` tokens.
+
+    ``count_tokens`` is a ``callable(text) -> int``. Returns the context
+    texts and the hits they were built from. The best entry is always kept,
+    cut down to the budget if it alone is too large.
+    """
+    contexts, used_hits, kept_shingles = [], [], []
+    remaining = token_budget
+
+    for text, members in _merge_neighbours(hits):
+        if not text:
+            continue
+        shingles = _shingles(text)
+        if _is_near_duplicate(shingles, kept_shingles, dedup_threshold):
+            continue
+
+        tokens = count_tokens(text)
+        if tokens > remaining:
+            if contexts:
+                continue
+            text = text[: max(1, len(text) * remaining // tokens)]
+            tokens = remaining
+
+        contexts.append(text)
+        used_hits.extend(members)
+        kept_shingles.append(shingles)
+        remaining -= tokens
+        if remaining <= 0:
+            break
+
+    return contexts, used_hits
@@ -0,0 +1,143 @@
+"""
+Embedding Cache: persistent, content-addressed store of embedding vectors.
+
+Vectors are keyed by (model name, SHA-256 of the embedded text) in SQLite,
+so re-ingesting unchanged content skips the model entirely. The store is
+bounded to ``max_entries`` rows and evicts least recently used rows first.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(self, path: str, model_name: str, max_entries: int = 1_000_000):
+        self.path = str(path)
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+        # Upper bound on the row count; only re-counted when it exceeds the limit.
+        (self._entries,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+
+    def get_many(self, hashes: list[str]) -> dict[str, np.ndarray]:
+        """Return cached vectors for the given text hashes."""
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+
+        with self._lock:
+            for i in range(0, len(unique), 500):
+                chunk = unique[i : i + 500]
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                    [self.model_name, *chunk],
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, self.model_name, h) for h in found],
+                )
+                self._conn.commit()
+
+            self.hits += sum(1 for h in hashes if h in found)
+            self.misses += sum(1 for h in hashes if h not in found)
+
+        return found
+
+    def put_many(self, items: dict[str, np.ndarray]):
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                [
+                    (self.model_name, h, np.asarray(v, dtype=np.float32).tobytes(), now)
+                    for h, v in items.items()
+                ],
+            )
+            self._entries += len(items)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        if self._entries <= self.max_entries:
+            return
+
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN "
+                "(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+        self._entries = min(count, self.max_entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+def encode_with_cache(embedder, cache: EmbeddingCache | None, texts: list[str]) -> np.ndarray:
+    """Encode ``texts`` with ``embedder``, reusing and filling ``cache``."""
+    if cache is None:
+        return embedder.encode(
+            texts,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+
+    hashes = [text_hash(t) for t in texts]
+    cached = cache.get_many(hashes)
+
+    missing = {}
+    for h, t in zip(hashes, texts):
+        if h not in cached:
+            missing.setdefault(h, t)
+
+    if missing:
+        vectors = embedder.encode(
+            list(missing.values()),
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        fresh = dict(zip(missing.keys(), vectors))
+        cache.put_many(fresh)
+        cached.update(fresh)
+
+    return np.stack([cached[h] for h in hashes])
@@ -0,0 +1,197 @@
+"""
+Embedding Service: one shared SentenceTransformer behind a localhost HTTP API.
+
+Run it with `manage.py embed_server`. Concurrent requests are coalesced into
+micro-batches so the model is loaded once and encodes many texts per call.
+Processes opt in by setting EMBED_SERVER_URL; get_embedder() then returns
+an EmbeddingClient instead of loading the model locally.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+# =========================================================
+# MICRO-BATCHING
+# =========================================================
+
+class MicroBatcher:
+    """
+    Coalesce concurrent encode calls into batches for a single model.
+
+    A batch is flushed once it holds ``max_batch`` texts or the oldest
+    request has waited ``max_wait_ms``.
+    """
+
+    def __init__(self, model, max_batch: int = 64, max_wait_ms: float = 5.0):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="embed-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: list[str]) -> Future:
+        future = Future()
+        self._queue.put((texts, future))
+        return future
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        return self.submit(texts).result()
+
+    def _collect(self) -> list[tuple[list[str], Future]]:
+        requests_ = [self._queue.get()]
+        size = len(requests_[0][0])
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            requests_.append(item)
+            size += len(item[0])
+
+        return requests_
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            texts = [t for texts, _ in batch for t in texts]
+
+            try:
+                vectors = self.model.encode(
+                    texts,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=False,
+                )
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for texts_, future in batch:
+                future.set_result(vectors[offset : offset + len(texts_)])
+                offset += len(texts_)
+
+
+# =========================================================
+# SERVER
+# =========================================================
+
+class _EmbedHandler(BaseHTTPRequestHandler):
+    batcher: MicroBatcher = None
+    # Keep-alive, so clients reuse connections; every response sends
+    # Content-Length. Idle connections are closed after ``timeout`` seconds.
+    protocol_version = "HTTP/1.1"
+    timeout = 60
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        # Read the whole body first: on a kept-alive connection, unread
+        # bytes would be parsed as the next request.
+        try:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        except ValueError:
+            self.close_connection = True
+            self._send_json(400, {"error": "Invalid Content-Length"})
+            return
+
+        if self.path != "/embed":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            texts = json.loads(body)["texts"]
+            if not isinstance(texts, list):
+                raise ValueError("'texts' must be a list of strings")
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        if not texts:
+            self._send_json(200, {"vectors": []})
+            return
+
+        try:
+            vectors = self.batcher.encode(texts)
+        except Exception as e:
+            logger.exception("Embedding failed")
+            self._send_json(500, {"error": str(e)})
+            return
+
+        self._send_json(200, {"vectors": vectors.tolist()})
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+def make_server(model, host: str, port: int, max_batch: int, max_wait_ms: float) -> ThreadingHTTPServer:
+    handler = type(
+        "EmbedHandler",
+        (_EmbedHandler,),
+        {"batcher": MicroBatcher(model, max_batch=max_batch, max_wait_ms=max_wait_ms)},
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+# =========================================================
+# CLIENT
+# =========================================================
+
+class EmbeddingClient:
+    """
+    Drop-in replacement for SentenceTransformer.encode backed by the server.
+
+    Vectors are always L2-normalized by the server.
+    """
+
+    def __init__(self, url: str, timeout: float = 60):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def encode(self, sentences, convert_to_numpy: bool = True, **kwargs):
+        texts = [sentences] if isinstance(sentences, str) else list(sentences)
+
+        response = self._session.post(
+            f"{self.url}/embed",
+            json={"texts": texts},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+
+        vectors = np.asarray(response.json()["vectors"], dtype=np.float32)
+        if isinstance(sentences, str):
+            vectors = vectors[0]
+        return vectors if convert_to_numpy else vectors.tolist()
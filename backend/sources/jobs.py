@@ -0,0 +1,266 @@
+"""
+Ingest jobs: a DB-backed queue that runs ingest_source off the request path.
+
+Views enqueue an IngestJob row; one or more `manage.py ingest_worker`
+processes claim queued rows and run them on a bounded thread pool.
+No broker is required, the Django database is the queue.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import ApiSource, IngestJob
+from .rag_service import delete_source_collection, ingest_source
+
+logger = logging.getLogger(__name__)
+
+
+# =========================================================
+# ENQUEUE
+# =========================================================
+
+def _active_job(source) -> IngestJob | None:
+    return IngestJob.objects.filter(source=source, status__in=["queued", "running"]).first()
+
+
+class JobConflict(Exception):
+    """A full ingest was requested while a sync of the source is already running."""
+
+    def __init__(self, job: IngestJob):
+        super().__init__(f"A sync of source {job.source_id} is already running")
+        self.job = job
+
+
+def _reuse(active: IngestJob, kind: str) -> IngestJob:
+    """
+    Return the active job for a request of ``kind``.
+
+    A full ingest covers a sync, but not the other way round: settings such
+    as quantization, HNSW parameters and the embedding model only apply on
+    a full ingest. A queued sync is therefore upgraded to an ingest; a
+    running one raises JobConflict.
+    """
+    if kind != "ingest" or active.kind == "ingest":
+        return active
+
+    upgraded = IngestJob.objects.filter(pk=active.pk, status="queued").update(
+        kind="ingest",
+        updated_at=timezone.now(),
+    )
+    if upgraded:
+        active.kind = "ingest"
+        return active
+    raise JobConflict(active)
+
+
+def enqueue_ingest(source, kind: str = "ingest") -> IngestJob:
+    """
+    Queue an ingestion run, reusing an active job for the same source.
+
+    A unique constraint allows one active job per source, so two requests
+    racing past the lookup still end up sharing one job. Raises
+    JobConflict when an ingest is requested during a running sync.
+    """
+    active = _active_job(source)
+    if active is not None:
+        return _reuse(active, kind)
+
+    try:
+        with transaction.atomic():
+            return IngestJob.objects.create(source=source, user=source.user, kind=kind)
+    except IntegrityError:
+        active = _active_job(source)
+        if active is None:
+            raise
+        return _reuse(active, kind)
+
+
+# =========================================================
+# CLAIMING
+# =========================================================
+
+def requeue_stale_jobs() -> int:
+    """Put running jobs whose worker stopped heartbeating back in the queue."""
+    cutoff = timezone.now() - timedelta(seconds=settings.INGEST_JOB_STALE_SECONDS)
+    return IngestJob.objects.filter(status="running", updated_at__lt=cutoff).update(
+        status="queued",
+        stage="",
+        worker_id="",
+        updated_at=timezone.now(),
+    )
+
+
+def claim_next_job(worker_id: str) -> IngestJob | None:
+    """
+    Atomically claim the oldest queued job that respects the concurrency limits.
+
+    A job is skipped while its user already has INGEST_MAX_JOBS_PER_USER jobs
+    running or while another job for the same source is running. Both
+    checks are part of the conditional UPDATE that claims the job, so
+    concurrent workers never run the same job and never claim past a limit
+    on stale counts.
+    """
+    busy_users = (
+        IngestJob.objects.filter(status="running")
+        .values("user_id")
+        .annotate(n=Count("id"))
+        .filter(n__gte=settings.INGEST_MAX_JOBS_PER_USER)
+        .values("user_id")
+    )
+
+    def claimable():
+        return (
+            IngestJob.objects.filter(status="queued")
+            .exclude(user_id__in=busy_users)
+            .exclude(source__ingest_jobs__status="running")
+        )
+
+    candidates = claimable().order_by("created_at").values_list("id", flat=True)[:20]
+
+    for job_id in list(candidates):
+        now = timezone.now()
+        claimed = claimable().filter(pk=job_id).update(
+            status="running",
+            worker_id=worker_id,
+            started_at=now,
+            updated_at=now,
+        )
+        if claimed:
+            return IngestJob.objects.select_related("source", "source__user").get(pk=job_id)
+
+    return None
+
+
+# =========================================================
+# EXECUTION
+# =========================================================
+
+def _cancel_deleted(job: IngestJob) -> None:
+    """The job's source was deleted mid-run: drop what the run stored again."""
+    logger.info("Source %s was deleted; cancelling ingest job %s", job.source_id, job.pk)
+    try:
+        delete_source_collection(job.source)
+    except Exception:
+        logger.exception("Could not clean up vectors of deleted source %s", job.source_id)
+    # Usually a no-op: the job row goes with its source.
+    IngestJob.objects.filter(pk=job.pk).update(
+        status="cancelled",
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+
+
+def run_job(job: IngestJob) -> None:
+    """Run one claimed job and record its outcome."""
+
+    def progress(stage: str, done: int, total: int):
+        IngestJob.objects.filter(pk=job.pk).update(
+            stage=stage,
+            progress=done,
+            total=total,
+            updated_at=timezone.now(),
+        )
+
+    started = time.monotonic()
+    try:
+        count = ingest_source(
+            job.source,
+            progress=progress,
+            incremental=job.kind == "sync",
+        )
+    except Exception as e:
+        if not ApiSource.objects.filter(pk=job.source_id).exists():
+            _cancel_deleted(job)
+            return
+        logger.exception("Ingest job %s failed", job.pk)
+        IngestJob.objects.filter(pk=job.pk).update(
+            status="failed",
+            error_message=str(e)[:500],
+            duration_seconds=time.monotonic() - started,
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        return
+
+    duration = time.monotonic() - started
+    logger.info("Ingest job %s for source %s took %.1fs", job.pk, job.source_id, duration)
+    IngestJob.objects.filter(pk=job.pk).update(
+        status="succeeded",
+        stage="done",
+        documents_ingested=count,
+        duration_seconds=duration,
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+
+
+# =========================================================
+# WORKER
+# =========================================================
+
+class IngestWorker:
+    """Polls the job table and runs jobs on a fixed-size thread pool."""
+
+    def __init__(self, concurrency: int = None, poll_interval: float = None):
+        self.concurrency = concurrency or settings.INGEST_WORKER_CONCURRENCY
+        self.poll_interval = poll_interval or settings.INGEST_POLL_INTERVAL
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._slots = threading.Semaphore(self.concurrency)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run_in_thread(self, job: IngestJob):
+        try:
+            run_job(job)
+        finally:
+            close_old_connections()
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def _heartbeat(self):
+        """Keep this worker's running jobs from being treated as stale."""
+        IngestJob.objects.filter(status="running", worker_id=self.worker_id).update(
+            updated_at=timezone.now()
+        )
+
+    def run(self, once: bool = False):
+        """Process jobs until stopped. With ``once``, drain the queue and return."""
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while not self._stop.is_set():
+                self._heartbeat()
+                requeue_stale_jobs()
+
+                if not self._slots.acquire(timeout=self.poll_interval):
+                    continue
+
+                job = claim_next_job(self.worker_id)
+                if job is None:
+                    self._slots.release()
+                    with self._lock:
+                        idle = self._in_flight == 0
+                    if once and idle and not IngestJob.objects.filter(status="queued").exists():
+                        break
+                    self._stop.wait(self.poll_interval)
+                    continue
+
+                logger.info("Worker %s picked up job %s", self.worker_id, job.pk)
+                with self._lock:
+                    self._in_flight += 1
+                pool.submit(self._run_in_thread, job)
+
+        close_old_connections()
@@ -0,0 +1,176 @@
+"""
+Lexical Index: a small on-disk BM25 index per source for exact-term recall.
+
+Dense vectors blur identifiers like SKUs and product codes; BM25 over the
+same normalized text catches them. An index is built one document at a time
+from the item stream during ingestion, written atomically as gzipped JSON
+and loaded lazily by searchers, which reload it when the file changes.
+
+The index holds point ids, document lengths and postings only, never the
+texts: those are already in the points' payloads. Building it therefore
+needs no more memory than the finished index.
+"""
+
+import gzip
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+
+# Identifiers keep inner dashes, dots and slashes ("SKU-1042", "v2.1").
+TOKEN_RE = re.compile(r"[0-9a-z]+(?:[-_./][0-9a-z]+)*")
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = TOKEN_RE.findall(text.lower())
+    # Also index the parts of compound identifiers so "1042" finds "sku-1042".
+    parts = [p for t in tokens if not t.isalnum() for p in re.split(r"[-_./]", t) if p]
+    return tokens + parts
+
+
+class BM25Index:
+    def __init__(self, ids: list[str], doc_lens: list[int], postings: dict, k1: float = 1.2, b: float = 0.75):
+        self.ids = ids
+        self.doc_lens = doc_lens
+        self.postings = postings
+        self.k1 = k1
+        self.b = b
+        self.avgdl = (sum(doc_lens) / len(doc_lens)) if doc_lens else 0.0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, query: str, limit: int) -> list[tuple[str, float]]:
+        """Return up to ``limit`` ``(point_id, score)`` pairs, best first."""
+        n = len(self.ids)
+        if not n:
+            return []
+
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc, tf in posting:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lens[doc] / self.avgdl)
+                scores[doc] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        best = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+        return [(self.ids[doc], score) for doc, score in best]
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "ids": self.ids,
+                    "doc_lens": self.doc_lens,
+                    "postings": self.postings,
+                },
+                f,
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        postings = {term: [tuple(p) for p in posting] for term, posting in data["postings"].items()}
+        return cls(data["ids"], data["doc_lens"], postings)
+
+
+class IndexBuilder:
+    """
+    Build a BM25Index incrementally, tokenizing each document as it is added.
+
+    With ``base`` the documents of a previous index are kept unless added
+    again, which is how delta syncs update an index. ``base`` itself is not
+    modified. A point id added twice keeps its last text.
+    """
+
+    def __init__(self, base: BM25Index | None = None):
+        self.base = base
+        self._base_docs = {point_id: doc for doc, point_id in enumerate(base.ids)} if base else {}
+        self._replaced = set()  # base doc numbers superseded by added docs
+        self._docs = {}  # point id -> latest doc number in this builder
+        self.ids = []
+        self.doc_lens = []
+        self.postings = defaultdict(list)
+
+    def add(self, point_id: str, text: str):
+        if point_id in self._base_docs:
+            self._replaced.add(self._base_docs[point_id])
+
+        doc = len(self.ids)
+        self._docs[point_id] = doc
+        tokens = tokenize(text)
+        self.ids.append(point_id)
+        self.doc_lens.append(len(tokens))
+        for term, tf in Counter(tokens).items():
+            self.postings[term].append((doc, tf))
+
+    def __len__(self):
+        return len(self._docs) + len(self._base_docs) - len(self._replaced)
+
+    def finish(self) -> BM25Index:
+        """Drop superseded documents, renumber the rest and return the index."""
+        ids, doc_lens = [], []
+        base_map, own_map = {}, {}
+
+        if self.base is not None:
+            for doc, point_id in enumerate(self.base.ids):
+                if doc not in self._replaced:
+                    base_map[doc] = len(ids)
+                    ids.append(point_id)
+                    doc_lens.append(self.base.doc_lens[doc])
+        for doc, point_id in enumerate(self.ids):
+            if self._docs[point_id] == doc:
+                own_map[doc] = len(ids)
+                ids.append(point_id)
+                doc_lens.append(self.doc_lens[doc])
+
+        postings = defaultdict(list)
+        if self.base is not None:
+            for term, posting in self.base.postings.items():
+                postings[term].extend((base_map[doc], tf) for doc, tf in posting if doc in base_map)
+        # Consume our own postings as they are copied so both never coexist in full.
+        while self.postings:
+            term, posting = self.postings.popitem()
+            postings[term].extend((own_map[doc], tf) for doc, tf in posting if doc in own_map)
+
+        return BM25Index(ids, doc_lens, {term: posting for term, posting in postings.items() if posting})
+
+
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def load_index(path: str) -> BM25Index | None:
+    """Process-cached index at ``path``, reloaded when the file changes."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    with _loaded_lock:
+        cached = _loaded.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    index = BM25Index.load(path)
+    with _loaded_lock:
+        _loaded[path] = (mtime, index)
+    return index
+
+
+def delete_index(path: str):
+    with _loaded_lock:
+        _loaded.pop(path, None)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
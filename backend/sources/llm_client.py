@@ -0,0 +1,45 @@
+"""
+LLM Client: one process-wide OpenAI-compatible client.
+
+Reusing one client keeps a pool of keep-alive connections to the LLM API
+instead of paying DNS and TLS setup on every question. Retries with
+exponential backoff are handled by the SDK. This module has no Django
+imports, so the standalone scripts in the repository root share it.
+"""
+
+import threading
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client(
+    api_key: str,
+    base_url: str,
+    timeout: float,
+    max_retries: int,
+    pool_size: int,
+    keepalive_expiry: float,
+):
+    """Return the shared client, built with this configuration on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import httpx
+                from openai import OpenAI, DefaultHttpxClient
+
+                _client = OpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    timeout=timeout,
+                    max_retries=max_retries,
+                    http_client=DefaultHttpxClient(
+                        limits=httpx.Limits(
+                            max_connections=pool_size,
+                            max_keepalive_connections=pool_size,
+                            keepalive_expiry=keepalive_expiry,
+                        ),
+                    ),
+                )
+    return _client
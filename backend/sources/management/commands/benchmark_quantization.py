@@ -0,0 +1,156 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from qdrant_client.models import PointStruct, SearchParams, QuantizationSearchParams
+
+from sources.models import ApiSource
+from sources.rag_service import (
+    _collection_for,
+    _create_collection,
+    _finish_bulk_load,
+    _wait_for_index,
+    embed_query,
+    get_qdrant_client,
+    hnsw_config,
+)
+
+MODES = ("none", "scalar", "binary")
+
+# Indexing threshold (KB) for the scratch collections: low enough that even
+# a small source gets an HNSW graph, so latencies compare indexed searches.
+BENCH_INDEXING_THRESHOLD = 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare recall@k and search latency of float32, scalar and binary "
+        "quantized copies of a source's vectors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("source_id", type=int)
+        parser.add_argument("--top-k", type=int, default=5)
+        parser.add_argument(
+            "--queries",
+            type=str,
+            default="",
+            help="File with one question per line. Defaults to stored vectors as queries.",
+        )
+        parser.add_argument("--sample", type=int, default=100, help="Stored vectors used as queries.")
+        parser.add_argument(
+            "--oversampling",
+            type=float,
+            default=None,
+            help="Defaults to QDRANT_QUANTIZATION_OVERSAMPLING.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            source = ApiSource.objects.select_related("user").get(pk=options["source_id"])
+        except ApiSource.DoesNotExist:
+            raise CommandError("Source not found")
+
+        client = get_qdrant_client()
+        top_k = options["top_k"]
+        oversampling = options["oversampling"] or settings.QDRANT_QUANTIZATION_OVERSAMPLING
+
+        points = self._load_points(client, source)
+        if not points:
+            raise CommandError("Source has no stored vectors; ingest it first")
+
+        if options["queries"]:
+            with open(options["queries"], encoding="utf-8") as f:
+                queries = [embed_query(line.strip()) for line in f if line.strip()]
+        else:
+            # Sampled points are held out of the scratch collections, or each
+            # query would trivially find itself and inflate recall.
+            sample = min(options["sample"], len(points) // 2)
+            if not sample:
+                raise CommandError("Too few stored vectors to sample queries from; pass --queries")
+            step = max(1, len(points) // sample)
+            sampled = set(range(0, len(points), step)[:sample])
+            queries = [points[i].vector for i in sorted(sampled)]
+            points = [p for i, p in enumerate(points) if i not in sampled]
+
+        self.stdout.write(f"{len(points)} vectors, {len(queries)} queries, recall@{top_k}")
+
+        names = {mode: f"bench_{source.id}_{mode}_{int(time.time())}" for mode in MODES}
+        try:
+            for mode, name in names.items():
+                _create_collection(client, name, mode, hnsw=hnsw_config(source), bulk=True)
+                for i in range(0, len(points), 256):
+                    client.upsert(collection_name=name, points=points[i : i + 256], wait=True)
+                _finish_bulk_load(client, name, BENCH_INDEXING_THRESHOLD)
+
+            # upsert(wait=True) does not wait for index or quantization
+            # building; measure only once every collection is optimized.
+            for mode, name in names.items():
+                ready = _wait_for_index(client, name)
+                info = client.get_collection(name)
+                self.stdout.write(
+                    f"{mode:>7}: {info.indexed_vectors_count or 0}/{info.points_count or 0} vectors indexed"
+                    + ("" if ready else " (timed out waiting for the index)")
+                )
+
+            # Ground truth: exact search over the float32 vectors.
+            truth = [
+                {str(r.id) for r in client.search(
+                    collection_name=names["none"],
+                    query_vector=q,
+                    limit=top_k,
+                    search_params=SearchParams(exact=True),
+                )}
+                for q in queries
+            ]
+
+            ef = source.search_ef or settings.QDRANT_SEARCH_EF
+            for mode, name in names.items():
+                quantization = None
+                if mode != "none":
+                    quantization = QuantizationSearchParams(rescore=True, oversampling=oversampling)
+                params = SearchParams(hnsw_ef=ef, quantization=quantization)
+
+                latencies, hits = [], 0
+                for q, expected in zip(queries, truth):
+                    started = time.perf_counter()
+                    results = client.search(
+                        collection_name=name,
+                        query_vector=q,
+                        limit=top_k,
+                        search_params=params,
+                    )
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    hits += len(expected & {str(r.id) for r in results})
+
+                recall = hits / max(1, sum(len(t) for t in truth))
+                p95 = sorted(latencies)[int(0.95 * (len(latencies) - 1))]
+                self.stdout.write(
+                    f"{mode:>7}: recall@{top_k}={recall:.3f}  "
+                    f"mean={statistics.mean(latencies):.2f}ms  p95={p95:.2f}ms"
+                )
+        finally:
+            for name in names.values():
+                if client.collection_exists(name):
+                    client.delete_collection(name)
+
+    def _load_points(self, client, source) -> list[PointStruct]:
+        collection_name, scroll_filter = _collection_for(source)
+        if not client.collection_exists(collection_name):
+            return []
+
+        points = []
+        offset = None
+        while True:
+            batch, offset = client.scroll(
+                collection_name=collection_name,
+                scroll_filter=scroll_filter,
+                limit=1000,
+                offset=offset,
+                with_payload=False,
+                with_vectors=True,
+            )
+            points.extend(PointStruct(id=p.id, vector=p.vector) for p in batch)
+            if offset is None:
+                return points
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from sentence_transformers import SentenceTransformer
+
+from sources.embedding_service import make_server
+
+
+class Command(BaseCommand):
+    help = "Serve the embedding model over localhost HTTP with request micro-batching."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--max-batch",
+            type=int,
+            default=settings.EMBED_SERVER_MAX_BATCH,
+            help="Texts per model call.",
+        )
+        parser.add_argument(
+            "--max-wait-ms",
+            type=float,
+            default=settings.EMBED_SERVER_MAX_WAIT_MS,
+            help="How long the first request of a batch waits for others.",
+        )
+
+    def handle(self, *args, **options):
+        model = SentenceTransformer(settings.EMBED_MODEL_NAME)
+        model.encode(["warmup"], show_progress_bar=False)
+
+        server = make_server(
+            model,
+            host=options["host"],
+            port=options["port"],
+            max_batch=options["max_batch"],
+            max_wait_ms=options["max_wait_ms"],
+        )
+        self.stdout.write(
+            f"Embedding server for {settings.EMBED_MODEL_NAME} on "
+            f"http://{options['host']}:{options['port']}"
+        )
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from sources.jobs import IngestWorker
+
+
+class Command(BaseCommand):
+    help = "Run queued source ingestion jobs on a bounded thread pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Jobs to run in parallel (defaults to INGEST_WORKER_CONCURRENCY).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        worker = IngestWorker(concurrency=options["concurrency"])
+        self.stdout.write(f"Ingest worker {worker.worker_id} started (concurrency={worker.concurrency})")
+
+        try:
+            worker.run(once=options["once"])
+        except KeyboardInterrupt:
+            worker.stop()
+
+        self.stdout.write("Ingest worker stopped")
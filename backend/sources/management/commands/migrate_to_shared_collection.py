@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from sources.models import ApiSource
+from sources.rag_service import copy_source_to_shared, shared_collection_name
+
+
+class Command(BaseCommand):
+    help = "Copy per-source Qdrant collections into the shared multi-tenant collection(s)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            type=int,
+            action="append",
+            dest="source_ids",
+            help="Only migrate this source id (repeatable).",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Delete each per-source collection once it has been copied.",
+        )
+
+    def handle(self, *args, **options):
+        sources = ApiSource.objects.select_related("user").order_by("id")
+        if options["source_ids"]:
+            sources = sources.filter(id__in=options["source_ids"])
+
+        total = 0
+        for source in sources:
+            copied = copy_source_to_shared(source, drop=options["drop"])
+            total += copied
+            self.stdout.write(
+                f"Source {source.id}: {copied} points -> {shared_collection_name(source)}"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Copied {total} points"))
@@ -0,0 +1,54 @@
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from sources.jobs import IngestWorker
+from sources.scheduler import enqueue_due_syncs, spread_unscheduled_sources
+
+
+class Command(BaseCommand):
+    help = "Queue scheduled syncs for sources whose sync interval has elapsed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Queue the currently due syncs and exit.",
+        )
+        parser.add_argument(
+            "--with-worker",
+            action="store_true",
+            help="Also run an ingest worker in this process to execute the queued jobs.",
+        )
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        worker = None
+
+        if options["with_worker"]:
+            worker = IngestWorker()
+            threading.Thread(target=worker.run, name="ingest-worker", daemon=True).start()
+            self.stdout.write(f"Ingest worker {worker.worker_id} started (concurrency={worker.concurrency})")
+
+        self.stdout.write("Sync scheduler started")
+
+        try:
+            while not stop.is_set():
+                spread_unscheduled_sources()
+                jobs = enqueue_due_syncs()
+                if jobs:
+                    self.stdout.write(f"Queued {len(jobs)} scheduled sync(s)")
+                close_old_connections()
+
+                if options["once"]:
+                    break
+                stop.wait(settings.SYNC_SCHEDULER_POLL_INTERVAL)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if worker is not None:
+                worker.stop()
+
+        self.stdout.write("Sync scheduler stopped")
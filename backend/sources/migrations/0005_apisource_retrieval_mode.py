@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sources', '0004_ingestjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apisource',
+            name='retrieval_mode',
+            field=models.CharField(choices=[('dense', 'Dense'), ('hybrid', 'Hybrid (dense + BM25)')], default='dense', help_text='Hybrid adds a BM25 index for exact matches on codes and IDs; takes effect on the next sync.', max_length=10),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sources', '0005_apisource_retrieval_mode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apisource',
+            name='chunk_strategy',
+            field=models.CharField(choices=[('char', 'Fixed character windows'), ('token', 'Token windows'), ('sentence', 'Sentences'), ('recursive', 'Recursive (paragraph, line, sentence)')], default='char', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='apisource',
+            name='chunk_size',
+            field=models.PositiveIntegerField(blank=True, help_text="Characters for 'char', tokens otherwise. Empty uses the default.", null=True),
+        ),
+        migrations.AddField(
+            model_name='apisource',
+            name='chunk_overlap',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
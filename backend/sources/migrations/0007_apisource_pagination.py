@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sources', '0006_apisource_chunking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apisource',
+            name='pagination',
+            field=models.JSONField(blank=True, default=dict, help_text="Pagination config, e.g. {'type': 'offset', 'offset_param': 'skip', 'page_size': 100, 'total_path': 'total'}. See sources/api_fetch.py."),
+        ),
+    ]
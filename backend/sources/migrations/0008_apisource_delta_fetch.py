@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sources', '0007_apisource_pagination'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apisource',
+            name='since_param',
+            field=models.CharField(blank=True, default='', help_text="Query parameter that asks the API for records changed since a value, e.g. 'updated_since'.", max_length=100),
+        ),
+        migrations.AddField(
+            model_name='apisource',
+            name='since_field',
+            field=models.CharField(blank=True, default='', help_text="Item field whose newest value is sent as since_param on the next sync, e.g. 'updated_at'.", max_length=100),
+        ),
+        migrations.AddField(
+            model_name='apisource',
+            name='fetch_state',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sources', '0008_apisource_delta_fetch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apisource',
+            name='response_format',
+            field=models.CharField(choices=[('json', 'JSON'), ('json_stream', 'JSON (streamed)'), ('ndjson', 'JSON lines')], default='json', help_text='Streamed formats read the response incrementally for very large exports.', max_length=20),
+        ),
+    ]
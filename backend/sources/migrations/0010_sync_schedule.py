@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sources', '0009_apisource_response_format'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apisource',
+            name='sync_interval_minutes',
+            field=models.PositiveIntegerField(blank=True, help_text='Re-sync automatically this often. Empty disables scheduled syncs.', null=True),
+        ),
+        migrations.AddField(
+            model_name='apisource',
+            name='next_sync_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='ingestjob',
+            name='duration_seconds',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
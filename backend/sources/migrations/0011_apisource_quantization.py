@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sources', '0010_sync_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apisource',
+            name='quantization',
+            field=models.CharField(blank=True, choices=[('', 'Deployment default'), ('none', 'None (float32)'), ('scalar', 'Scalar (int8)'), ('binary', 'Binary')], default='', help_text='Vector quantization; applies from the next full ingest.', max_length=10),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sources', '0011_apisource_quantization'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apisource',
+            name='hnsw_m',
+            field=models.PositiveIntegerField(blank=True, help_text='Graph links per vector. Higher improves recall at the cost of memory.', null=True),
+        ),
+        migrations.AddField(
+            model_name='apisource',
+            name='hnsw_ef_construct',
+            field=models.PositiveIntegerField(blank=True, help_text='Candidates considered while building the index.', null=True),
+        ),
+        migrations.AddField(
+            model_name='apisource',
+            name='search_ef',
+            field=models.PositiveIntegerField(blank=True, help_text='Candidates considered per search. Higher improves recall at the cost of latency.', null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:40
+
+from django.db import migrations, models
+
+
+def cancel_duplicate_active_jobs(apps, schema_editor):
+    """Keep the oldest active job per source so the constraint can be added."""
+    IngestJob = apps.get_model('sources', 'IngestJob')
+    seen = set()
+    for job in IngestJob.objects.filter(status__in=['queued', 'running']).order_by('created_at'):
+        if job.source_id in seen:
+            IngestJob.objects.filter(pk=job.pk).update(status='cancelled')
+        seen.add(job.source_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sources', '0012_apisource_hnsw'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ingestjob',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], default='queued', max_length=20),
+        ),
+        migrations.RunPython(cancel_duplicate_active_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='ingestjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['queued', 'running'])), fields=('source',), name='unique_active_ingest_job_per_source'),
+        ),
+    ]
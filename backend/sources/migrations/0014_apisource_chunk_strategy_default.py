@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:15
+
+from django.db import migrations, models
+
+
+def keep_existing_sources_on_char(apps, schema_editor):
+    """Sources created before this migration keep the windows they were indexed with."""
+    ApiSource = apps.get_model('sources', 'ApiSource')
+    ApiSource.objects.exclude(chunk_strategy__in=['token', 'sentence', 'recursive']).update(chunk_strategy='char')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sources', '0013_ingestjob_unique_active'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_existing_sources_on_char, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='apisource',
+            name='chunk_strategy',
+            field=models.CharField(choices=[('char', 'Fixed character windows'), ('token', 'Token windows'), ('sentence', 'Sentences'), ('recursive', 'Recursive (paragraph, line, sentence)')], default='token', max_length=10),
+        ),
+    ]
@@ -10,6 +10,31 @@ class ApiSource(models.Model):
         ("pdf", "PDF"),
     ]
 
+    RETRIEVAL_MODE_CHOICES = [
+        ("dense", "Dense"),
+        ("hybrid", "Hybrid (dense + BM25)"),
+    ]
+
+    RESPONSE_FORMAT_CHOICES = [
+        ("json", "JSON"),
+        ("json_stream", "JSON (streamed)"),
+        ("ndjson", "JSON lines"),
+    ]
+
+    CHUNK_STRATEGY_CHOICES = [
+        ("char", "Fixed character windows"),
+        ("token", "Token windows"),
+        ("sentence", "Sentences"),
+        ("recursive", "Recursive (paragraph, line, sentence)"),
+    ]
+
+    QUANTIZATION_CHOICES = [
+        ("", "Deployment default"),
+        ("none", "None (float32)"),
+        ("scalar", "Scalar (int8)"),
+        ("binary", "Binary"),
+    ]
+
     STATUS_CHOICES = [
         ("pending", "Pending"),
         ("ingesting", "Ingesting"),
@@ -35,11 +60,79 @@ class ApiSource(models.Model):
         default="",
         help_text="JSON path to the array of items, e.g. 'products' or 'data.items'",
     )
+    response_format = models.CharField(
+        max_length=20,
+        choices=RESPONSE_FORMAT_CHOICES,
+        default="json",
+        help_text="Streamed formats read the response incrementally for very large exports.",
+    )
+    since_param = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        help_text="Query parameter that asks the API for records changed since a value, e.g. 'updated_since'.",
+    )
+    since_field = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        help_text="Item field whose newest value is sent as since_param on the next sync, e.g. 'updated_at'.",
+    )
+    # Validators and watermark from the last successful fetch.
+    fetch_state = models.JSONField(default=dict, blank=True)
+    pagination = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Pagination config, e.g. {'type': 'offset', 'offset_param': 'skip', 'page_size': 100, 'total_path': 'total'}. See sources/api_fetch.py.",
+    )
+    retrieval_mode = models.CharField(
+        max_length=10,
+        choices=RETRIEVAL_MODE_CHOICES,
+        default="dense",
+        help_text="Hybrid adds a BM25 index for exact matches on codes and IDs; takes effect on the next sync.",
+    )
+    quantization = models.CharField(
+        max_length=10,
+        choices=QUANTIZATION_CHOICES,
+        blank=True,
+        default="",
+        help_text="Vector quantization; applies from the next full ingest.",
+    )
+    # HNSW tuning. Build parameters apply from the next full ingest; empty
+    # uses the deployment defaults.
+    hnsw_m = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Graph links per vector. Higher improves recall at the cost of memory.",
+    )
+    hnsw_ef_construct = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Candidates considered while building the index.",
+    )
+    search_ef = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Candidates considered per search. Higher improves recall at the cost of latency.",
+    )
+    chunk_strategy = models.CharField(max_length=10, choices=CHUNK_STRATEGY_CHOICES, default="token")
+    chunk_size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Characters for 'char', tokens otherwise. Empty uses the default.",
+    )
+    chunk_overlap = models.PositiveIntegerField(null=True, blank=True)
 
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
     document_count = models.IntegerField(default=0)
     error_message = models.TextField(blank=True, default="")
     last_synced = models.DateTimeField(null=True, blank=True)
+    sync_interval_minutes = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Re-sync automatically this often. Empty disables scheduled syncs.",
+    )
+    next_sync_at = models.DateTimeField(null=True, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -56,3 +149,57 @@ class ApiSource(models.Model):
     def collection_name(self):
         """Qdrant collection name for this source."""
         return f"source_{self.id}_{self.user.id}"
+
+
+class IngestJob(models.Model):
+    """A queued ingestion run for a source, executed by the ingest worker."""
+
+    KIND_CHOICES = [
+        ("ingest", "Ingest"),
+        ("sync", "Sync"),
+    ]
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+        ("cancelled", "Cancelled"),
+    ]
+
+    source = models.ForeignKey(ApiSource, on_delete=models.CASCADE, related_name="ingest_jobs")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="ingest_jobs")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default="ingest")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    stage = models.CharField(max_length=50, blank=True, default="")
+    progress = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    documents_ingested = models.IntegerField(default=0)
+    error_message = models.TextField(blank=True, default="")
+    duration_seconds = models.FloatField(null=True, blank=True)
+    worker_id = models.CharField(max_length=255, blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+        constraints = [
+            # At most one queued or running job per source.
+            models.UniqueConstraint(
+                fields=["source"],
+                condition=models.Q(status__in=["queued", "running"]),
+                name="unique_active_ingest_job_per_source",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} for {self.source.name} [{self.status}]"
+
+    @property
+    def is_active(self):
+        return self.status in ("queued", "running")
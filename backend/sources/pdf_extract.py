@@ -0,0 +1,72 @@
+"""
+PDF Extract: page text extraction, optionally spread over worker processes.
+
+pypdf is pure Python, so a large PDF keeps one core busy for minutes.
+``iter_page_texts`` splits the page list into ranges, extracts them in a
+process pool and yields pages back in order as ranges complete. This module
+only imports pypdf so worker processes start quickly.
+"""
+
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from pypdf import PdfReader
+
+
+def _clean(text: str, keep_lines: bool = False) -> str:
+    """
+    Collapse whitespace. With ``keep_lines``, line breaks survive and runs
+    of blank lines become one paragraph break, for structure-aware chunking.
+    """
+    if not keep_lines:
+        return re.sub(r"\s+", " ", text or "").strip()
+    lines = [re.sub(r"[^\S\n]+", " ", line).strip() for line in (text or "").split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def extract_page_range(pdf_path: str, start: int, end: int, keep_lines: bool = False) -> list[tuple[int, str]]:
+    """Return ``(page_number, text)`` for pages ``start``..``end - 1`` (0-based)."""
+    reader = PdfReader(pdf_path)
+    return [
+        (index + 1, _clean(reader.pages[index].extract_text(), keep_lines))
+        for index in range(start, end)
+    ]
+
+
+def iter_page_texts(pdf_path: str, workers: int = 1, pages_per_task: int = 16, keep_lines: bool = False):
+    """
+    Yield ``(page_number, text)`` for every page, in page order.
+
+    With ``workers`` > 1 and more than one task's worth of pages, ranges of
+    ``pages_per_task`` pages are extracted in a process pool. At most two
+    ranges per worker are queued ahead of the consumer, which bounds memory.
+    ``keep_lines`` preserves line and paragraph breaks (see ``_clean``).
+    """
+    reader = PdfReader(pdf_path)
+    page_count = len(reader.pages)
+
+    if workers <= 1 or page_count <= pages_per_task:
+        for index, page in enumerate(reader.pages, start=1):
+            yield index, _clean(page.extract_text(), keep_lines)
+        return
+
+    del reader
+    ranges = deque(
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    )
+    pending = deque()
+
+    # "spawn" because ingestion runs on threads; forking a threaded process
+    # can copy held locks into the child.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+        try:
+            while ranges or pending:
+                while ranges and len(pending) < workers * 2:
+                    pending.append(pool.submit(extract_page_range, pdf_path, *ranges.popleft(), keep_lines))
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
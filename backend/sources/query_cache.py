@@ -0,0 +1,91 @@
+"""
+Query Cache: in-process LRU of normalized question -> query vector.
+
+Entries expire after ``ttl`` seconds and the least recently used entry is
+dropped once ``max_size`` is reached. Optionally the Django cache is used as
+a second level so workers share vectors.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+class QueryVectorCache:
+    def __init__(self, model_name: str, max_size: int = 2048, ttl: float = 3600, shared_cache=None):
+        self.model_name = model_name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.shared_cache = shared_cache
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _shared_key(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return f"qvec:{self.model_name}:{digest}"
+
+    def get(self, query: str) -> np.ndarray | None:
+        key = normalize_query(query)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                vector, expires = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return vector
+                del self._entries[key]
+
+        if self.shared_cache is not None:
+            stored = self.shared_cache.get(self._shared_key(key))
+            if stored is not None:
+                vector = np.asarray(stored, dtype=np.float32)
+                self._store(key, vector)
+                with self._lock:
+                    self.shared_hits += 1
+                return vector
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, query: str, vector: np.ndarray):
+        key = normalize_query(query)
+        vector = np.asarray(vector, dtype=np.float32)
+        self._store(key, vector)
+
+        if self.shared_cache is not None:
+            self.shared_cache.set(self._shared_key(key), vector.tolist(), timeout=self.ttl)
+
+    def _store(self, key: str, vector: np.ndarray):
+        with self._lock:
+            self._entries[key] = (vector, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+            }
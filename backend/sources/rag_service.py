@@ -4,82 +4,380 @@ RAG Service: Handles fetching API data, embedding, and storing in Qdrant.
 
 import hashlib
 import json
-import requests
+import logging
+import os
 import re
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid5, NAMESPACE_URL
 
+import numpy as np
 from django.conf import settings
+from django.db import DatabaseError
 from django.utils import timezone
 
-from sentence_transformers import SentenceTransformer
+from sentence_transformers import CrossEncoder, SentenceTransformer
 from qdrant_client import QdrantClient
-from qdrant_client.models import VectorParams, Distance, PointStruct
-from pypdf import PdfReader
+from qdrant_client.models import (
+    VectorParams,
+    Distance,
+    PointStruct,
+    PointIdsList,
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
+    FieldCondition,
+    Filter,
+    FilterSelector,
+    MatchValue,
+    PayloadSchemaType,
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    CollectionStatus,
+    HnswConfigDiff,
+    OptimizersConfigDiff,
+)
+from .api_fetch import fetcher_for_source
+from .chunking import Chunker
+from .context_packer import pack_contexts
+from .embedding_cache import EmbeddingCache, encode_with_cache
+from .embedding_service import EmbeddingClient
+from .lexical_index import IndexBuilder, delete_index, load_index
+from .llm_client import get_llm_client as _shared_llm_client
+from .pdf_extract import iter_page_texts
+from .query_cache import QueryVectorCache
+from .signals import source_ingested
+
+logger = logging.getLogger(__name__)
 
 
 # =========================================================
 # SINGLETON EMBEDDER
 # =========================================================
 
+# The getters below are called from concurrent ingest worker and search
+# threads, so each singleton is created under a lock (double-checked).
 _embedder = None
+_embedder_lock = threading.Lock()
 
 
-def get_embedder() -> SentenceTransformer:
+def get_embedder() -> SentenceTransformer | EmbeddingClient:
     global _embedder
     if _embedder is None:
-        _embedder = SentenceTransformer(settings.EMBED_MODEL_NAME)
-        _embedder.encode(["warmup"], show_progress_bar=False)
+        with _embedder_lock:
+            if _embedder is None:
+                if settings.EMBED_SERVER_URL:
+                    embedder = EmbeddingClient(settings.EMBED_SERVER_URL)
+                else:
+                    embedder = SentenceTransformer(settings.EMBED_MODEL_NAME)
+                    embedder.encode(["warmup"], show_progress_bar=False)
+                # Published only once warmed up.
+                _embedder = embedder
     return _embedder
 
 
+# =========================================================
+# EMBEDDING CACHE
+# =========================================================
+
+_embedding_cache = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Shared on-disk embedding cache, or None when EMBED_CACHE_PATH is empty."""
+    global _embedding_cache
+    if _embedding_cache is None and settings.EMBED_CACHE_PATH:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache(
+                    settings.EMBED_CACHE_PATH,
+                    model_name=settings.EMBED_MODEL_NAME,
+                    max_entries=settings.EMBED_CACHE_MAX_ENTRIES,
+                )
+    return _embedding_cache
+
+
+# =========================================================
+# QUERY VECTOR CACHE
+# =========================================================
+
+_query_cache = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryVectorCache:
+    global _query_cache
+    if _query_cache is None:
+        with _query_cache_lock:
+            if _query_cache is None:
+                shared = None
+                if settings.QUERY_CACHE_USE_DJANGO_CACHE:
+                    from django.core.cache import cache as shared
+
+                _query_cache = QueryVectorCache(
+                    model_name=settings.EMBED_MODEL_NAME,
+                    max_size=settings.QUERY_CACHE_SIZE,
+                    ttl=settings.QUERY_CACHE_TTL,
+                    shared_cache=shared,
+                )
+    return _query_cache
+
+
+def embed_query(query: str) -> list[float]:
+    """Embed a search query, reusing cached vectors for repeated questions."""
+    cache = get_query_cache()
+    vector = cache.get(query)
+    if vector is None:
+        vector = get_embedder().encode(
+            [query],
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )[0]
+        cache.put(query, vector)
+    return vector.tolist()
+
+
+# =========================================================
+# TOKENIZERS
+# =========================================================
+
+_tokenizers = {}
+_tokenizers_lock = threading.Lock()
+
+
+def get_tokenizer(name: str):
+    """Process-wide Hugging Face fast tokenizer, loaded on first use."""
+    with _tokenizers_lock:
+        if name not in _tokenizers:
+            from transformers import AutoTokenizer
+
+            _tokenizers[name] = AutoTokenizer.from_pretrained(name)
+        return _tokenizers[name]
+
+
 # =========================================================
 # QDRANT CLIENT
 # =========================================================
 
 _qdrant_client = None
+_qdrant_client_lock = threading.Lock()
 
 
 def get_qdrant_client() -> QdrantClient:
     global _qdrant_client
     if _qdrant_client is None:
-        _qdrant_client = QdrantClient(
-            url=settings.QDRANT_URL,
-            api_key=settings.QDRANT_API_KEY or None,
-        )
+        with _qdrant_client_lock:
+            if _qdrant_client is None:
+                _qdrant_client = QdrantClient(
+                    url=settings.QDRANT_URL,
+                    api_key=settings.QDRANT_API_KEY or None,
+                )
     return _qdrant_client
 
 
 # =========================================================
-# DATA FETCHING
+# COLLECTIONS + ALIASES
 # =========================================================
+# `source.collection_name` is a Qdrant alias pointing at a versioned
+# physical collection (`<alias>_v<timestamp>`). Full rebuilds write into a
+# fresh version and flip the alias, so searches never see an empty index.
+
+def get_alias_target(client, alias: str) -> str | None:
+    """Return the physical collection an alias points to, if any."""
+    for a in client.get_aliases().aliases:
+        if a.alias_name == alias:
+            return a.collection_name
+    return None
+
+
+# Names recently confirmed to exist -> expiry (monotonic seconds). Only
+# positive answers are cached, so a freshly built source is seen at once.
+_known_collections = {}
+_known_collections_lock = threading.Lock()
+
+
+def collection_exists(client, name: str) -> bool:
+    """True if ``name`` is a collection or an alias to one."""
+    now = time.monotonic()
+    with _known_collections_lock:
+        if _known_collections.get(name, 0) > now:
+            return True
+
+    exists = client.collection_exists(name)
+    if exists:
+        _remember_collection(name)
+    return exists
+
+
+def _remember_collection(name: str):
+    with _known_collections_lock:
+        _known_collections[name] = time.monotonic() + settings.QDRANT_EXISTS_CACHE_TTL
+
+
+def _forget_collection(name: str):
+    with _known_collections_lock:
+        _known_collections.pop(name, None)
+
+
+def _swap_alias(client, alias: str, target: str):
+    """Atomically point ``alias`` at ``target``."""
+    operations = []
+    if get_alias_target(client, alias) is not None:
+        operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=alias)))
+    else:
+        # Collections created before aliases were introduced use the alias
+        # name directly; it must go before the alias can take its place.
+        collection_names = [c.name for c in client.get_collections().collections]
+        if alias in collection_names:
+            client.delete_collection(alias)
+    operations.append(
+        CreateAliasOperation(create_alias=CreateAlias(collection_name=target, alias_name=alias))
+    )
+    client.update_collection_aliases(change_aliases_operations=operations)
+    _remember_collection(alias)
 
-def fetch_api_data(api_url: str, api_key: str = "", headers: dict = None, data_path: str = "") -> list[dict]:
-    request_headers = headers or {}
-    if api_key:
-        request_headers["Authorization"] = f"Bearer {api_key}"
 
-    response = requests.get(api_url, headers=request_headers, timeout=60)
-    response.raise_for_status()
+def _drop_old_versions(client, alias: str, keep: str | None = None):
+    prefix = f"{alias}_v"
+    for c in client.get_collections().collections:
+        if c.name.startswith(prefix) and c.name != keep:
+            client.delete_collection(c.name)
 
-    data = response.json()
 
-    # Navigate JSON path
-    if data_path:
-        for key in data_path.split("."):
-            key = key.strip()
-            if isinstance(data, dict) and key in data:
-                data = data[key]
-            else:
-                raise ValueError(f"Path '{data_path}' not found in API response")
+def delete_source_collection(source):
+    """Remove a source's vectors from wherever the storage mode keeps them."""
+    client = get_qdrant_client()
+    delete_index(lexical_index_path(source))
+
+    if shared_storage():
+        name = shared_collection_name(source)
+        if collection_exists(client, name):
+            client.delete(
+                collection_name=name,
+                points_selector=FilterSelector(filter=source_filter(source)),
+            )
+        # Leftover from before the source was copied over without --drop.
+        if not client.collection_exists(source.collection_name):
+            return
+
+    _delete_per_source_collection(client, source.collection_name)
 
-    # Ensure list
-    if isinstance(data, dict):
-        data = [data]
 
-    if not isinstance(data, list):
-        raise ValueError("API response is not a list or object")
+def _delete_per_source_collection(client, alias: str):
+    """Remove a per-source alias and every collection version behind it."""
+    if get_alias_target(client, alias) is not None:
+        client.update_collection_aliases(
+            change_aliases_operations=[
+                DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=alias))
+            ]
+        )
+    elif alias in [c.name for c in client.get_collections().collections]:
+        client.delete_collection(alias)
 
-    return data
+    _forget_collection(alias)
+    _drop_old_versions(client, alias)
+
+
+# =========================================================
+# SHARED (MULTI-TENANT) STORAGE
+# =========================================================
+# With QDRANT_STORAGE_MODE = "shared" every source lives in one collection
+# (or one of QDRANT_SHARED_SHARDS collections, picked by user id) and is
+# told apart by indexed `source_id` / `user_id` payload fields. Searches
+# and deletes are filtered on `source_id`.
+
+def shared_storage() -> bool:
+    return settings.QDRANT_STORAGE_MODE == "shared"
+
+
+def shared_collection_name(source) -> str:
+    """Shared collection holding ``source``; a user's sources share a shard."""
+    base = settings.QDRANT_SHARED_COLLECTION
+    if settings.QDRANT_SHARED_SHARDS <= 1:
+        return base
+    return f"{base}_{source.user_id % settings.QDRANT_SHARED_SHARDS}"
+
+
+def source_filter(source) -> Filter:
+    return Filter(must=[FieldCondition(key="source_id", match=MatchValue(value=source.id))])
+
+
+def ensure_shared_collection(client, name: str):
+    """Create a shared collection with its tenant payload indexes if missing."""
+    if collection_exists(client, name):
+        return
+
+    try:
+        _create_collection(client, name, quantization_mode(), hnsw=hnsw_config())
+    except Exception:
+        # Another worker may have created it first.
+        if not client.collection_exists(name):
+            raise
+
+    for field in ("source_id", "user_id"):
+        client.create_payload_index(
+            collection_name=name,
+            field_name=field,
+            field_schema=PayloadSchemaType.INTEGER,
+        )
+    _remember_collection(name)
+
+
+def copy_source_to_shared(source, drop: bool = False) -> int:
+    """
+    Copy a source's per-source collection into its shared collection.
+
+    Vectors are copied as stored, nothing is re-embedded. With ``drop`` the
+    per-source collection is removed once the copy is complete. Returns the
+    number of points copied.
+    """
+    client = get_qdrant_client()
+    alias = source.collection_name
+    if not client.collection_exists(alias):
+        return 0
+
+    target = shared_collection_name(source)
+    ensure_shared_collection(client, target)
+
+    copied = 0
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=alias,
+            limit=settings.INGEST_BATCH_SIZE,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        if points:
+            client.upsert(
+                collection_name=target,
+                points=[
+                    PointStruct(
+                        id=p.id,
+                        vector=p.vector,
+                        payload={**(p.payload or {}), "source_id": source.id, "user_id": source.user_id},
+                    )
+                    for p in points
+                ],
+            )
+            copied += len(points)
+        if offset is None:
+            break
+
+    if drop:
+        _delete_per_source_collection(client, alias)
+
+    return copied
 
 
 # =========================================================
@@ -104,138 +402,530 @@ def normalize_item(item: dict, index: int) -> dict:
     }
 
 
-def normalize_pdf_chunks(pdf_path: str) -> list[dict]:
-    reader = PdfReader(pdf_path)
-    normalized = []
-
-    for page_index, page in enumerate(reader.pages, start=1):
-        text = page.extract_text() or ""
-        text = re.sub(r"\s+", " ", text).strip()
-        if not text:
-            continue
-
-        chunk_size = 1200
-        overlap = 200
-        start = 0
-        chunk_idx = 0
-
-        while start < len(text):
-            end = min(start + chunk_size, len(text))
-            chunk_text = text[start:end].strip()
-            if chunk_text:
-                chunk_idx += 1
-                chunk_id = f"page_{page_index}_chunk_{chunk_idx}"
-                chunk_hash = hashlib.sha256(chunk_text.encode("utf-8")).hexdigest()
-                normalized.append(
-                    {
-                        "id": chunk_id,
-                        "text": f"Page {page_index}: {chunk_text}",
-                        "hash": chunk_hash,
-                    }
-                )
-            if end == len(text):
-                break
-            start = max(end - overlap, 0)
+def get_chunker(source=None) -> Chunker:
+    """
+    Chunker configured for ``source``, or the legacy PDF character windows.
+
+    Token strategies are capped below EMBED_MAX_TOKENS, leaving room for the
+    model's special tokens and a chunk label ("Page N: ", or an item label
+    of at most LABEL_MAX_TOKENS).
+    """
+    strategy = source.chunk_strategy if source is not None else "char"
+
+    if strategy == "char":
+        size = (source and source.chunk_size) or 1200
+        overlap = source.chunk_overlap if source and source.chunk_overlap is not None else 200
+        return Chunker("char", size, min(overlap, size - 1))
+
+    limit = settings.EMBED_MAX_TOKENS - 2 - LABEL_MAX_TOKENS
+    size = min(source.chunk_size or settings.CHUNK_DEFAULT_TOKENS, limit)
+    overlap = source.chunk_overlap if source.chunk_overlap is not None else settings.CHUNK_DEFAULT_OVERLAP_TOKENS
+    return Chunker(strategy, size, min(overlap, size - 1), tokenizer=get_tokenizer(settings.EMBED_TOKENIZER_NAME))
+
+
+# Room reserved for a chunk label in token-chunked text.
+LABEL_MAX_TOKENS = 14
+# Labels stay short enough for the context packer to recognise and strip
+# them when it stitches neighbouring chunks back together.
+LABEL_MAX_CHARS = 40
+
+
+def _chunk_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _item_label(item: dict, item_id: str, chunker: Chunker) -> str:
+    """Short ``"<id> <name>: "`` prefix tying a piece back to its item."""
+    name = next((str(item[key]) for key in ("name", "title") if item.get(key)), "")
+    label = re.sub(r"[:\s]+", " ", f"{item_id} {name}" if name else f"Item {item_id}").strip()
+    label = label[:LABEL_MAX_CHARS].strip()
+    while label and len(chunker.tokenizer(f"{label}: ", add_special_tokens=False)["input_ids"]) > LABEL_MAX_TOKENS:
+        label = label[:-4].strip()
+    return f"{label}: " if label else ""
+
+
+def iter_item_chunks(item: dict, index: int, chunker: Chunker):
+    """
+    Yield an API item as one normalized object, or as ``<id>_chunk_<n>``
+    pieces when its text is longer than one chunk.
+
+    Only the first piece holds the item's ``id:``/``name:`` lines, so every
+    piece is prefixed with a short item label, as PDF chunks are with their
+    page. Legacy character chunking never splits items.
+    """
+    obj = normalize_item(item, index)
+    pieces = chunker.split(obj["text"]) if chunker.strategy != "char" else []
+    if len(pieces) <= 1:
+        yield obj
+        return
+
+    label = _item_label(item, obj["id"], chunker)
+    for n, piece in enumerate(pieces, start=1):
+        text = f"{label}{piece}"
+        yield {
+            "id": f"{obj['id']}_chunk_{n}",
+            "text": text,
+            "hash": _chunk_hash(text),
+        }
+
+
+def iter_pdf_chunks(pdf_path: str, chunker: Chunker = None):
+    """
+    Yield normalized chunks page by page without holding the whole PDF text.
+
+    Page text is extracted on PDF_EXTRACT_WORKERS processes when that is
+    more than one.
+    """
+    chunker = chunker or get_chunker()
+    pages = iter_page_texts(
+        pdf_path,
+        workers=settings.PDF_EXTRACT_WORKERS,
+        pages_per_task=settings.PDF_EXTRACT_PAGES_PER_TASK,
+        # Paragraph and line breaks guide the structure-aware strategies.
+        keep_lines=chunker.strategy != "char",
+    )
 
-    return normalized
+    for page_index, text in pages:
+        for chunk_idx, chunk_text in enumerate(chunker.split(text), start=1):
+            yield {
+                "id": f"page_{page_index}_chunk_{chunk_idx}",
+                "text": f"Page {page_index}: {chunk_text}",
+                "hash": _chunk_hash(chunk_text),
+            }
 
 
 # =========================================================
 # INGEST PIPELINE
 # =========================================================
 
-def ingest_source(source) -> int:
-    source.status = "ingesting"
-    source.error_message = ""
-    source.save()
+def _report(progress, stage: str, done: int = 0, total: int = 0):
+    if progress is not None:
+        progress(stage, done, total)
 
-    try:
-        if source.source_type == "pdf":
-            if not source.pdf_file:
-                raise ValueError("PDF source has no file attached.")
-            normalized = normalize_pdf_chunks(source.pdf_file.path)
-        else:
-            items = fetch_api_data(
-                api_url=source.api_url,
-                api_key=source.api_key,
-                headers=source.headers,
-                data_path=source.data_path,
-            )
-            normalized = [normalize_item(item, i) for i, item in enumerate(items)]
 
-        if not normalized:
-            source.status = "ready"
-            source.document_count = 0
-            source.last_synced = timezone.now()
-            source.save()
-            return 0
+def _point_id(source, raw_id: str) -> str:
+    return str(uuid5(NAMESPACE_URL, f"{source.id}:{raw_id}"))
 
-        texts = [obj["text"] for obj in normalized]
 
-        embedder = get_embedder()
-        vectors = embedder.encode(
-            texts,
-            convert_to_numpy=True,
-            normalize_embeddings=True,
-            show_progress_bar=False,
-        )
+def _iter_normalized(source, fetcher=None):
+    if source.source_type == "pdf":
+        if not source.pdf_file:
+            raise ValueError("PDF source has no file attached.")
+        yield from iter_pdf_chunks(source.pdf_file.path, get_chunker(source))
+        return
+
+    chunker = get_chunker(source)
+    for i, item in enumerate(fetcher or fetcher_for_source(source)):
+        yield from iter_item_chunks(item, i, chunker)
 
-        client = get_qdrant_client()
-        collection_name = source.collection_name
 
-        # Check if collection exists
-        collections = client.get_collections().collections
-        collection_names = [c.name for c in collections]
+def _batched(iterable, size: int):
+    batch = []
+    for obj in iterable:
+        batch.append(obj)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
-        if collection_name in collection_names:
-            client.delete_collection(collection_name)
 
-        client.create_collection(
+def _existing_hashes(client, collection_name: str, scroll_filter: Filter = None) -> dict[str, str]:
+    """Map point id -> content hash for every point already stored."""
+    hashes = {}
+    offset = None
+    while True:
+        points, offset = client.scroll(
             collection_name=collection_name,
-            vectors_config=VectorParams(
-                size=settings.EMBED_DIM,
-                distance=Distance.COSINE,
-            ),
+            scroll_filter=scroll_filter,
+            limit=1000,
+            offset=offset,
+            with_payload=["hash"],
+            with_vectors=False,
         )
+        for p in points:
+            hashes[str(p.id)] = (p.payload or {}).get("hash", "")
+        if offset is None:
+            return hashes
+
 
-        ids = [
-            str(uuid5(NAMESPACE_URL, f"{source.id}:{obj['id']}"))
-            for obj in normalized
-        ]
+def _build_points(source, objs: list[dict]) -> list[PointStruct]:
+    vectors = encode_with_cache(
+        get_embedder(),
+        get_embedding_cache(),
+        [obj["text"] for obj in objs],
+    )
 
-        payloads = [
-            {
+    return [
+        PointStruct(
+            id=_point_id(source, obj["id"]),
+            vector=vectors[i].tolist(),
+            payload={
                 "text": obj["text"],
                 "source_id": source.id,
+                "user_id": source.user_id,
                 "source_name": source.name,
                 "source_type": source.source_type,
                 "raw_id": obj["id"],
                 "hash": obj["hash"],
-            }
-            for obj in normalized
-        ]
+            },
+        )
+        for i, obj in enumerate(objs)
+    ]
+
+
+def _embed_and_upsert(client, collection_name: str, source, objs, progress=None) -> int:
+    """
+    Embed and upsert a stream of normalized items batch by batch.
+
+    Upserts run on a background thread so batch N+1 is embedded while batch N
+    is sent to Qdrant. At most INGEST_MAX_INFLIGHT_BATCHES upserts are
+    pending at once, which keeps memory proportional to the batch size.
+    """
+    written = 0
+    pending = deque()
+
+    def upsert(points: list[PointStruct]) -> int:
+        client.upsert(collection_name=collection_name, points=points)
+        return len(points)
+
+    with ThreadPoolExecutor(max_workers=1) as uploader:
+        try:
+            for batch in _batched(objs, settings.INGEST_BATCH_SIZE):
+                points = _build_points(source, batch)
+
+                while len(pending) >= settings.INGEST_MAX_INFLIGHT_BATCHES:
+                    written += pending.popleft().result()
+                    _report(progress, "indexing", written)
+
+                pending.append(uploader.submit(upsert, points))
+
+            while pending:
+                written += pending.popleft().result()
+                _report(progress, "indexing", written)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    return written
+
+
+def _delete_vanished(client, collection_name: str, existing: dict, seen: set, progress=None):
+    # An empty fetch is treated like before: nothing is removed.
+    vanished = [pid for pid in existing if pid not in seen] if seen else []
+    if vanished:
+        _report(progress, "deleting", 0, len(vanished))
+        for i in range(0, len(vanished), 1000):
+            client.delete(
+                collection_name=collection_name,
+                points_selector=PointIdsList(points=vanished[i : i + 1000]),
+            )
+
+
+def quantization_mode(source=None) -> str:
+    """
+    "none", "scalar" or "binary" for ``source``'s collection.
+
+    Sources may override QDRANT_QUANTIZATION, except in shared storage mode
+    where one collection holds every source.
+    """
+    if source is not None and source.quantization and not shared_storage():
+        return source.quantization
+    return settings.QDRANT_QUANTIZATION
+
+
+def quantization_config(mode: str):
+    if mode == "scalar":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=settings.QDRANT_SCALAR_QUANTILE,
+                always_ram=True,
+            )
+        )
+    if mode == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    return None
+
+
+def hnsw_config(source=None) -> HnswConfigDiff | None:
+    """
+    HNSW build parameters for a new collection: the source's overrides,
+    else the deployment defaults. Shared collections always use the
+    defaults. None keeps Qdrant's own defaults.
+    """
+    m, ef_construct = settings.QDRANT_HNSW_M, settings.QDRANT_HNSW_EF_CONSTRUCT
+    if source is not None and not shared_storage():
+        m = source.hnsw_m or m
+        ef_construct = source.hnsw_ef_construct or ef_construct
+    if m is None and ef_construct is None:
+        return None
+    return HnswConfigDiff(m=m, ef_construct=ef_construct)
+
+
+def _create_collection(
+    client,
+    collection_name: str,
+    quantization: str = "none",
+    hnsw: HnswConfigDiff | None = None,
+    bulk: bool = False,
+):
+    """
+    Create a collection. Quantized collections keep the compact vectors in
+    RAM and, with QDRANT_VECTORS_ON_DISK, the float originals on disk for
+    rescoring.
+
+    With ``bulk`` indexing is switched off so an initial upload only
+    appends; call ``_finish_bulk_load`` afterwards to build the index once.
+    """
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=VectorParams(
+            size=settings.EMBED_DIM,
+            distance=Distance.COSINE,
+            on_disk=quantization != "none" and settings.QDRANT_VECTORS_ON_DISK,
+        ),
+        quantization_config=quantization_config(quantization),
+        hnsw_config=hnsw,
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=0) if bulk else None,
+    )
+
+
+def _finish_bulk_load(client, collection_name: str, indexing_threshold: int | None = None):
+    """Re-enable indexing after a bulk upload; Qdrant builds the index in the background."""
+    client.update_collection(
+        collection_name=collection_name,
+        optimizers_config=OptimizersConfigDiff(
+            indexing_threshold=indexing_threshold or settings.QDRANT_INDEXING_THRESHOLD,
+        ),
+    )
+
+
+def _wait_for_index(client, collection_name: str, progress=None) -> bool:
+    """
+    Block until Qdrant has finished optimizing ``collection_name``.
+
+    Done means status GREEN: the optimizer is idle. ``indexed_vectors_count``
+    is only reported, because Qdrant applies the indexing threshold per
+    segment and never indexes segments below it, so the count need not
+    reach the number of points. Gives up after QDRANT_INDEX_WAIT_TIMEOUT
+    seconds and returns False.
+    """
+    deadline = time.monotonic() + settings.QDRANT_INDEX_WAIT_TIMEOUT
+
+    while True:
+        # Give the optimizer a moment to pick up a configuration change
+        # before a GREEN status is trusted.
+        time.sleep(settings.QDRANT_INDEX_POLL_INTERVAL)
+        info = client.get_collection(collection_name)
+        _report(progress, "indexing", info.indexed_vectors_count or 0, info.points_count or 0)
+        if info.status == CollectionStatus.GREEN:
+            return True
+        if time.monotonic() >= deadline:
+            logger.warning(
+                "Collection %s still optimizing after %ss",
+                collection_name, settings.QDRANT_INDEX_WAIT_TIMEOUT,
+            )
+            return False
+
+
+def search_params(source) -> SearchParams | None:
+    """
+    Query-time parameters for ``source``.
+
+    Sources with at most QDRANT_EXACT_SEARCH_MAX_POINTS points are searched
+    exactly: a brute-force scan of so few vectors is as fast as the graph
+    and never misses. Otherwise ``ef`` (the source's ``search_ef`` or
+    QDRANT_SEARCH_EF) trades latency for recall, and quantized sources
+    oversample candidates and rescore them with the original vectors.
+    """
+    if 0 < source.document_count <= settings.QDRANT_EXACT_SEARCH_MAX_POINTS:
+        return SearchParams(exact=True)
+
+    quantization = None
+    if quantization_mode(source) != "none":
+        quantization = QuantizationSearchParams(
+            ignore=False,
+            rescore=True,
+            oversampling=settings.QDRANT_QUANTIZATION_OVERSAMPLING,
+        )
+
+    ef = source.search_ef or settings.QDRANT_SEARCH_EF
+    if ef is None and quantization is None:
+        return None
+    return SearchParams(hnsw_ef=ef, quantization=quantization)
+
+
+def _save_source(source, *fields):
+    """
+    Save ``fields`` of a source being ingested.
+
+    Unlike a plain ``save()``, this never re-inserts a source that was
+    deleted while its job was running: Django raises DatabaseError when the
+    UPDATE matches no row.
+    """
+    source.save(update_fields=[*fields, "updated_at"])
+
 
-        points = [
-            PointStruct(id=ids[i], vector=vectors[i].tolist(), payload=payloads[i])
-            for i in range(len(ids))
-        ]
+def ingest_source(source, progress=None, incremental: bool = False) -> int:
+    """
+    Fetch, embed and store a source.
 
-        batch_size = 100
-        for i in range(0, len(points), batch_size):
-            batch = points[i : i + batch_size]
-            client.upsert(collection_name=collection_name, points=batch)
+    With ``incremental`` the existing collection is diffed against the fresh
+    data by content hash: only new or changed items are embedded, vanished
+    items are deleted and unchanged vectors are left in place. Otherwise a
+    new collection version is built and swapped in behind the alias.
+
+    Incremental syncs of unpaginated API sources are also conditional on
+    the ETag / Last-Modified saved by the previous fetch: a 304 ends the run
+    before anything is diffed or embedded. Sources with ``since_param`` only
+    fetch records changed since the last watermark; such partial fetches
+    cannot reveal deletions, so nothing is removed until the next full
+    ingest.
+
+    In shared storage mode there is no per-source collection to swap: a full
+    ingest re-embeds every item and upserts it in place, then removes the
+    source's vanished points, so searches keep seeing the old data until
+    each point is replaced.
+
+    ``progress`` is an optional ``callable(stage, done, total)`` used by the
+    ingest worker to record job progress.
+    """
+    source.status = "ingesting"
+    source.error_message = ""
+    _save_source(source, "status", "error_message")
+
+    try:
+        client = get_qdrant_client()
+        collection_name = source.collection_name
+
+        if shared_storage():
+            collection_name = shared_collection_name(source)
+            ensure_shared_collection(client, collection_name)
+            diff = True
+        else:
+            diff = incremental and collection_exists(client, collection_name)
+        # A delta fetch only makes sense on top of previously stored data.
+        stored = diff and source.document_count > 0
+
+        # Probe before diffing, so an unchanged source costs one request
+        # instead of a scroll over every stored point.
+        _report(progress, "fetching")
+        fetcher = None
+        if source.source_type == "api":
+            fetcher = fetcher_for_source(source, delta=incremental and stored)
+            if not fetcher.probe():
+                logger.info("Source %s not modified since last sync", source.id)
+                source.fetch_state = {**source.fetch_state, "checked_at": timezone.now().isoformat()}
+                source.status = "ready"
+                _save_source(source, "fetch_state", "status")
+                return source.document_count
+
+        partial = fetcher is not None and fetcher.is_delta
+
+        # Point id -> content hash of what is already stored, or None when a
+        # new collection version is built from scratch.
+        existing = None
+        if diff:
+            _report(progress, "diffing")
+            existing = _existing_hashes(
+                client,
+                collection_name,
+                source_filter(source) if shared_storage() else None,
+            )
+
+        # Point ids seen in this run; later duplicates of a raw id overwrite
+        # earlier ones, as upsert would.
+        seen = set()
+
+        # BM25 index of hybrid sources, built as items stream past. Partial
+        # fetches update the previous index: changed records override their
+        # old entries.
+        index_path = lexical_index_path(source)
+        hybrid = source.retrieval_mode == "hybrid"
+        lexical = IndexBuilder(load_index(index_path) if partial else None) if hybrid else None
+
+        def track(objs):
+            for obj in objs:
+                point_id = _point_id(source, obj["id"])
+                seen.add(point_id)
+                if lexical is not None:
+                    lexical.add(point_id, obj["text"])
+                yield obj
+
+        if existing is not None:
+            objs = track(_iter_normalized(source, fetcher))
+            if incremental:
+                objs = (
+                    obj for obj in objs
+                    if existing.get(_point_id(source, obj["id"])) != obj["hash"]
+                )
+            _embed_and_upsert(client, collection_name, source, objs, progress)
+            if not partial:
+                _delete_vanished(client, collection_name, existing, seen, progress)
+        else:
+            # Blue/green: build a new version while the alias keeps serving
+            # the old one, then flip the alias and drop the old versions.
+            version_name = f"{collection_name}_v{timezone.now():%Y%m%d%H%M%S%f}"
+            # Upload without indexing, then build the HNSW graph once at the
+            # end instead of updating it point by point. The old version
+            # keeps serving until the new graph is built, so searches never
+            # hit an unindexed collection.
+            bulk = settings.QDRANT_BULK_INGEST
+            _create_collection(
+                client,
+                version_name,
+                quantization_mode(source),
+                hnsw=hnsw_config(source),
+                bulk=bulk,
+            )
+            try:
+                _embed_and_upsert(client, version_name, source, track(_iter_normalized(source, fetcher)), progress)
+                if bulk:
+                    _finish_bulk_load(client, version_name)
+                if seen:
+                    _wait_for_index(client, version_name, progress)
+                    _swap_alias(client, collection_name, version_name)
+            except Exception:
+                client.delete_collection(version_name)
+                raise
+
+            if seen:
+                _drop_old_versions(client, collection_name, keep=version_name)
+            else:
+                client.delete_collection(version_name)
+
+        if not hybrid:
+            delete_index(index_path)
+        elif seen:
+            _report(progress, "lexical_index", 0, len(lexical))
+            lexical.finish().save(index_path)
+
+        cache = get_embedding_cache()
+        if cache is not None:
+            logger.info("Embedding cache after ingesting source %s: %s", source.id, cache.stats())
+
+        document_count = len(seen | set(existing)) if partial else len(seen)
 
         source.status = "ready"
-        source.document_count = len(normalized)
+        source.document_count = document_count
         source.last_synced = timezone.now()
-        source.save()
+        if fetcher is not None and (seen or partial):
+            source.fetch_state = fetcher.new_state()
+        _save_source(source, "status", "document_count", "last_synced", "fetch_state")
 
-        return len(normalized)
+        source_ingested.send(sender=source.__class__, source=source)
+
+        return document_count
 
     except Exception as e:
         source.status = "error"
         source.error_message = str(e)[:500]
-        source.save()
+        try:
+            _save_source(source, "status", "error_message")
+        except DatabaseError:
+            # The source was deleted while ingesting; nothing left to mark.
+            pass
         raise
 
 
@@ -243,38 +933,139 @@ def ingest_source(source) -> int:
 # SEARCH
 # =========================================================
 
-def search_source(source, query: str, top_k: int = 5) -> dict:
-    embedder = get_embedder()
-    query_vector = embedder.encode(
-        [query],
-        convert_to_numpy=True,
-        normalize_embeddings=True,
-    )[0].tolist()
+def lexical_index_path(source) -> str:
+    return os.path.join(settings.LEXICAL_INDEX_DIR, f"source_{source.id}.json.gz")
+
+
+# Search result in the shape of a Qdrant ScoredPoint; fused hybrid results
+# are built from both dense and lexical hits.
+Hit = namedtuple("Hit", ["id", "score", "payload", "vector"], defaults=[None])
+
+
+def _collection_for(source) -> tuple[str, Filter | None]:
+    """Collection holding ``source`` and the filter selecting its points."""
+    if shared_storage():
+        return shared_collection_name(source), source_filter(source)
+    return source.collection_name, None
 
-    client = get_qdrant_client()
-    collection_name = source.collection_name
 
-    # Check collection exists
-    collections = client.get_collections().collections
-    collection_names = [c.name for c in collections]
+def _dense_hits(source, query_vector: list[float], limit: int, with_vectors: bool = False) -> list:
+    """Scored Qdrant hits for one source, or [] if it has no vectors yet."""
+    client = get_qdrant_client()
+    collection_name, query_filter = _collection_for(source)
 
-    if collection_name not in collection_names:
-        return {"contexts": [], "sources": []}
+    if not collection_exists(client, collection_name):
+        return []
 
-    results = client.search(
+    return client.search(
         collection_name=collection_name,
         query_vector=query_vector,
-        limit=top_k,
+        query_filter=query_filter,
+        search_params=search_params(source),
+        limit=limit,
         with_payload=True,
+        with_vectors=with_vectors,
     )
 
-    contexts = []
-    sources_set = set()
 
-    for r in results:
+def _fill_points(source, hits: list[Hit], with_vectors: bool = False) -> list[Hit]:
+    """
+    Fetch payloads (and, with ``with_vectors``, vectors) missing from hits.
+
+    Hits found only by the lexical index carry just an id and a score; their
+    text lives in the point payload. Hits whose point is gone are dropped.
+    """
+    missing = [
+        hit.id for hit in hits
+        if hit.payload is None or (with_vectors and hit.vector is None)
+    ]
+    if not missing:
+        return hits
+
+    collection_name, _ = _collection_for(source)
+    points = get_qdrant_client().retrieve(
+        collection_name=collection_name,
+        ids=missing,
+        with_payload=True,
+        with_vectors=with_vectors,
+    )
+    found = {str(p.id): p for p in points}
+
+    filled = []
+    for hit in hits:
+        point = found.get(str(hit.id))
+        if point is None:
+            if hit.payload is not None:
+                filled.append(hit)
+            continue
+        filled.append(hit._replace(
+            payload=hit.payload if hit.payload is not None else point.payload,
+            vector=hit.vector if hit.vector is not None else point.vector,
+        ))
+    return filled
+
+
+def _fuse_rrf(rankings: list[list[Hit]], limit: int) -> list[Hit]:
+    """Reciprocal-rank fusion: sum 1 / (k + rank) of each hit across rankings."""
+    k = settings.HYBRID_RRF_K
+    scores = {}
+    firsts = {}
+    for ranking in rankings:
+        for rank, hit in enumerate(ranking, start=1):
+            key = str(hit.id)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            # Prefer the hit that carries the most: dense hits have payloads.
+            if key not in firsts or (firsts[key].vector is None and hit.vector is not None):
+                firsts[key] = hit
+
+    best = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+    return [Hit(key, score, firsts[key].payload, firsts[key].vector) for key, score in best]
+
+
+def _search_hits(source, query: str, query_vector: list[float], limit: int, with_vectors: bool = False) -> list:
+    """
+    Best hits for one source.
+
+    Hybrid sources over-fetch from both the vector index and the source's
+    BM25 index and fuse the two rankings; until a BM25 index has been built
+    they fall back to dense search.
+    """
+    index = load_index(lexical_index_path(source)) if source.retrieval_mode == "hybrid" else None
+    if index is None:
+        return _dense_hits(source, query_vector, limit, with_vectors=with_vectors)
+
+    candidates = limit * settings.HYBRID_CANDIDATE_FACTOR
+    dense = _dense_hits(source, query_vector, candidates, with_vectors=with_vectors)
+    lexical = [Hit(point_id, score, None) for point_id, score in index.search(query, candidates)]
+    fused = _fuse_rrf([dense, lexical], limit)
+    return _fill_points(source, fused, with_vectors)
+
+
+def count_tokens(text: str) -> int:
+    """
+    Token count of ``text`` with the local CONTEXT_TOKENIZER_NAME tokenizer.
+
+    It is not the LLM's own tokenizer, but it is close enough to budget a
+    prompt. With no tokenizer configured, four characters count as a token.
+    """
+    if not settings.CONTEXT_TOKENIZER_NAME:
+        return len(text) // 4 + 1
+    tokenizer = get_tokenizer(settings.CONTEXT_TOKENIZER_NAME)
+    return len(tokenizer.encode(text, add_special_tokens=False))
+
+
+def _format_results(hits) -> dict:
+    """Pack hits into deduplicated contexts within CONTEXT_TOKEN_BUDGET."""
+    contexts, used = pack_contexts(
+        hits,
+        count_tokens,
+        token_budget=settings.CONTEXT_TOKEN_BUDGET,
+        dedup_threshold=settings.CONTEXT_DEDUP_THRESHOLD,
+    )
+
+    sources_set = set()
+    for r in used:
         payload = r.payload or {}
-        if "text" in payload:
-            contexts.append(payload["text"])
         if "source_name" in payload:
             sources_set.add(payload["source_name"])
 
@@ -284,13 +1075,190 @@ def search_source(source, query: str, top_k: int = 5) -> dict:
     }
 
 
+# =========================================================
+# RERANKING
+# =========================================================
+
+_reranker = None
+_reranker_lock = threading.Lock()
+
+
+def get_reranker() -> CrossEncoder:
+    global _reranker
+    with _reranker_lock:
+        if _reranker is None:
+            _reranker = CrossEncoder(settings.RERANK_MODEL_NAME, device="cpu")
+    return _reranker
+
+
+def _rerank_hits(query: str, hits: list, top_k: int) -> list:
+    """
+    Keep the ``top_k`` hits a cross-encoder scores highest for ``query``.
+
+    Pairs are scored in RERANK_BATCH_SIZE batches. If scoring runs past
+    RERANK_BUDGET_MS the rerank is abandoned and the first-stage order is
+    kept, so a slow CPU never costs more than the budget.
+    """
+    if not settings.RERANK_ENABLED or len(hits) <= 1:
+        return hits[:top_k]
+
+    deadline = time.monotonic() + settings.RERANK_BUDGET_MS / 1000
+    reranker = get_reranker()
+    pairs = [(query, (hit.payload or {}).get("text", "")) for hit in hits]
+    scores = []
+
+    for i in range(0, len(pairs), settings.RERANK_BATCH_SIZE):
+        if time.monotonic() > deadline:
+            logger.info("Rerank budget exceeded after %d of %d hits; keeping vector order", i, len(hits))
+            return hits[:top_k]
+        batch = pairs[i : i + settings.RERANK_BATCH_SIZE]
+        scores.extend(reranker.predict(batch, batch_size=len(batch), show_progress_bar=False))
+
+    order = sorted(range(len(hits)), key=lambda i: scores[i], reverse=True)
+    return [hits[i] for i in order[:top_k]]
+
+
+# =========================================================
+# MMR DIVERSITY
+# =========================================================
+
+def _mmr_select(query_vector: list[float], hits: list, top_k: int, mmr_lambda: float) -> list:
+    """
+    Pick ``top_k`` hits by Maximal Marginal Relevance.
+
+    Each step takes the hit maximising
+    ``lambda * sim(query, hit) - (1 - lambda) * max sim(hit, selected)``,
+    so near-duplicates of an already chosen hit lose out to other relevant
+    ones. Vectors are stored L2-normalized, so dot products are cosines.
+    """
+    hits = [hit for hit in hits if hit.vector is not None]
+    if len(hits) <= top_k:
+        return hits
+
+    vectors = np.asarray([hit.vector for hit in hits], dtype=np.float32)
+    relevance = vectors @ np.asarray(query_vector, dtype=np.float32)
+    similarity = vectors @ vectors.T
+
+    selected = [int(np.argmax(relevance))]
+    # Highest similarity of every candidate to anything selected so far.
+    redundancy = similarity[selected[0]].copy()
+
+    while len(selected) < top_k:
+        scores = mmr_lambda * relevance - (1 - mmr_lambda) * redundancy
+        scores[selected] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        np.maximum(redundancy, similarity[best], out=redundancy)
+
+    return [hits[i] for i in selected]
+
+
+def _select_hits(query: str, query_vector: list[float], hits: list, top_k: int, mmr_lambda: float | None) -> list:
+    if mmr_lambda is None:
+        return _rerank_hits(query, hits, top_k)
+    pool = _rerank_hits(query, hits, top_k * settings.MMR_FETCH_FACTOR)
+    return _mmr_select(query_vector, pool, top_k, mmr_lambda)
+
+
+# =========================================================
+# SEARCH API
+# =========================================================
+
+def _fetch_limit(top_k: int, mmr_lambda: float | None = None) -> int:
+    """How many first-stage hits to fetch so rerank and MMR have a pool to choose from."""
+    limit = top_k * settings.RERANK_FETCH_FACTOR if settings.RERANK_ENABLED else top_k
+    if mmr_lambda is not None:
+        limit *= settings.MMR_FETCH_FACTOR
+    return limit
+
+
+def search_source(source, query: str, top_k: int = 5, mmr_lambda: float | None = None) -> dict:
+    """
+    Search one source. With ``mmr_lambda`` (0..1) the final ``top_k`` are
+    picked by MMR; lower values favour diversity over relevance.
+    """
+    query_vector = embed_query(query)
+    hits = _search_hits(
+        source,
+        query,
+        query_vector,
+        _fetch_limit(top_k, mmr_lambda),
+        with_vectors=mmr_lambda is not None,
+    )
+    return _format_results(_select_hits(query, query_vector, hits, top_k, mmr_lambda))
+
+
+_search_pool = None
+_search_pool_lock = threading.Lock()
+
+
+def _get_search_pool() -> ThreadPoolExecutor:
+    global _search_pool
+    with _search_pool_lock:
+        if _search_pool is None:
+            _search_pool = ThreadPoolExecutor(
+                max_workers=settings.SEARCH_MAX_PARALLEL,
+                thread_name_prefix="search",
+            )
+    return _search_pool
+
+
+def _interleave_by_rank(hits_per_source: list[list], top_k: int) -> list:
+    """
+    Merge per-source hits into one ranking of at most ``top_k``.
+
+    Raw scores are not comparable across sources (cosine for dense sources,
+    RRF for hybrid ones), so hits are ordered by their rank within their own
+    source: every source's best hit comes before any source's second best,
+    with ties in session source order. Each source thus gets an equal share
+    of the slots, and slots a short source cannot fill go to the next ranks
+    of the others.
+    """
+    ranked = sorted(
+        ((rank, i, hit) for i, hits in enumerate(hits_per_source) for rank, hit in enumerate(hits)),
+        key=lambda entry: entry[:2],
+    )
+    return [hit for _, _, hit in ranked[:top_k]]
+
+
+def search_sources(sources: list, query: str, top_k: int = 5, mmr_lambda: float | None = None) -> dict:
+    """
+    Search several sources at once and merge the hits by per-source rank.
+
+    The query is embedded once and the per-source searches run concurrently,
+    so latency tracks the slowest source rather than the sum of them.
+    """
+    if len(sources) == 1:
+        return search_source(sources[0], query, top_k=top_k, mmr_lambda=mmr_lambda)
+
+    limit = _fetch_limit(top_k, mmr_lambda)
+    query_vector = embed_query(query)
+    pool = _get_search_pool()
+    futures = [
+        pool.submit(_search_hits, source, query, query_vector, limit, mmr_lambda is not None)
+        for source in sources
+    ]
+    hits_per_source = [f.result() for f in futures]
+
+    merged = _interleave_by_rank(hits_per_source, limit)
+    return _format_results(_select_hits(query, query_vector, merged, top_k, mmr_lambda))
+
+
 # =========================================================
 # LLM QUERY
 # =========================================================
 
-def query_llm(question: str, contexts: list[str], agent_role: str = "") -> str:
-    from openai import OpenAI
+NO_CONTEXT_ANSWER = (
+    "## Answer\n"
+    "- I could not find relevant information in your indexed data.\n"
+    "## Key Facts from Data\n"
+    "- No matching context was retrieved.\n"
+    "## Sources Used\n"
+    "- None"
+)
 
+
+def _build_llm_messages(question: str, contexts: list[str], agent_role: str = "") -> list[dict]:
     role_block = agent_role.strip() if agent_role else (
         "You are a helpful assistant that answers questions using only the provided context."
     )
@@ -306,42 +1274,76 @@ def query_llm(question: str, contexts: list[str], agent_role: str = "") -> str:
         "If data is missing, say it clearly in '## Answer' and keep other sections brief."
     )
 
-    if not contexts:
-        return (
-            "## Answer\n"
-            "- I could not find relevant information in your indexed data.\n"
-            "## Key Facts from Data\n"
-            "- No matching context was retrieved.\n"
-            "## Sources Used\n"
-            "- None"
-        )
-
     context_block = "\n\n".join(f"- {c}" for c in contexts)
 
-    client = OpenAI(
+    return [
+        {
+            "role": "system",
+            "content": (
+                f"{role_block}\n\n"
+                "You must answer ONLY using provided context. "
+                "If answer is not in context, explicitly say you do not know.\n\n"
+                f"{structure_block}"
+            ),
+        },
+        {
+            "role": "user",
+            "content": f"Context:\n{context_block}\n\nQuestion: {question}",
+        },
+    ]
+
+
+def get_llm_client():
+    """Process-wide OpenAI-compatible client configured from settings."""
+    return _shared_llm_client(
         api_key=settings.GROQ_API_KEY,
-        base_url="https://api.groq.com/openai/v1",
+        base_url=settings.LLM_BASE_URL,
+        timeout=settings.LLM_TIMEOUT,
+        max_retries=settings.LLM_MAX_RETRIES,
+        pool_size=settings.LLM_POOL_SIZE,
+        keepalive_expiry=settings.LLM_KEEPALIVE_SECONDS,
     )
 
-    response = client.chat.completions.create(
+
+def query_llm(question: str, contexts: list[str], agent_role: str = "") -> str:
+    if not contexts:
+        return NO_CONTEXT_ANSWER
+
+    response = get_llm_client().chat.completions.create(
         model=settings.LLM_MODEL,
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    f"{role_block}\n\n"
-                    "You must answer ONLY using provided context. "
-                    "If answer is not in context, explicitly say you do not know.\n\n"
-                    f"{structure_block}"
-                ),
-            },
-            {
-                "role": "user",
-                "content": f"Context:\n{context_block}\n\nQuestion: {question}",
-            },
-        ],
+        messages=_build_llm_messages(question, contexts, agent_role),
         temperature=0.2,
         max_tokens=1024,
     )
 
     return response.choices[0].message.content.strip()
+
+
+def stream_llm(question: str, contexts: list[str], agent_role: str = ""):
+    """
+    Yield answer text deltas as the model produces them.
+
+    Closing the generator (e.g. the HTTP client went away) closes the
+    upstream stream, which cancels the completion request.
+    """
+    if not contexts:
+        yield NO_CONTEXT_ANSWER
+        return
+
+    stream = get_llm_client().chat.completions.create(
+        model=settings.LLM_MODEL,
+        messages=_build_llm_messages(question, contexts, agent_role),
+        temperature=0.2,
+        max_tokens=1024,
+        stream=True,
+    )
+
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+    finally:
+        stream.close()
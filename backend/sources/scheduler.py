@@ -0,0 +1,80 @@
+"""
+Sync scheduler: queue periodic re-syncs for sources with a sync interval.
+
+`manage.py sync_scheduler` polls for sources whose `next_sync_at` has
+passed and enqueues a sync job for each through the ingest job queue, so
+the ingest workers' concurrency limits apply. Next run times are jittered
+so sources sharing an interval do not all hit their APIs and Qdrant at
+once.
+"""
+
+import logging
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .jobs import enqueue_ingest
+from .models import ApiSource, IngestJob
+
+logger = logging.getLogger(__name__)
+
+
+def next_run_after(source, now=None):
+    """``now`` plus the source's interval, jittered by SYNC_SCHEDULER_JITTER."""
+    now = now or timezone.now()
+    interval = source.sync_interval_minutes * 60
+    jitter = interval * settings.SYNC_SCHEDULER_JITTER
+    return now + timedelta(seconds=interval + random.uniform(-jitter, jitter))
+
+
+def spread_unscheduled_sources(now=None) -> int:
+    """Give sources with an interval but no next run a random first run time."""
+    now = now or timezone.now()
+    count = 0
+    for source in ApiSource.objects.filter(sync_interval_minutes__isnull=False, next_sync_at__isnull=True):
+        offset = random.uniform(0, source.sync_interval_minutes * 60)
+        count += ApiSource.objects.filter(pk=source.pk, next_sync_at__isnull=True).update(
+            next_sync_at=now + timedelta(seconds=offset)
+        )
+    return count
+
+
+def enqueue_due_syncs(now=None) -> list[IngestJob]:
+    """
+    Queue a sync for every due source, up to the global pending-job cap.
+
+    A source is claimed by moving its `next_sync_at` forward with a
+    conditional UPDATE, so concurrent schedulers never queue it twice. A
+    source that still has an active job keeps that job instead of a new one.
+    Only API sources are synced; PDFs do not change upstream.
+    """
+    now = now or timezone.now()
+
+    active = IngestJob.objects.filter(status__in=["queued", "running"]).count()
+    room = settings.SYNC_SCHEDULER_MAX_ACTIVE_JOBS - active
+    if room <= 0:
+        return []
+
+    due = (
+        ApiSource.objects.filter(
+            source_type="api",
+            sync_interval_minutes__isnull=False,
+            next_sync_at__lte=now,
+        )
+        .select_related("user")
+        .order_by("next_sync_at")[:room]
+    )
+
+    jobs = []
+    for source in due:
+        claimed = ApiSource.objects.filter(pk=source.pk, next_sync_at=source.next_sync_at).update(
+            next_sync_at=next_run_after(source, now)
+        )
+        if not claimed:
+            continue
+        jobs.append(enqueue_ingest(source, kind="sync"))
+        logger.info("Scheduled sync of source %s", source.pk)
+
+    return jobs
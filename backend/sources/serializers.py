@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import ApiSource
+from .api_fetch import PAGINATION_TYPES
+from .models import ApiSource, IngestJob
 
 
 class ApiSourceSerializer(serializers.ModelSerializer):
@@ -15,14 +16,62 @@ class ApiSourceSerializer(serializers.ModelSerializer):
             "headers",
             "pdf_file",
             "data_path",
+            "pagination",
+            "response_format",
+            "since_param",
+            "since_field",
+            "retrieval_mode",
+            "quantization",
+            "hnsw_m",
+            "hnsw_ef_construct",
+            "search_ef",
+            "chunk_strategy",
+            "chunk_size",
+            "chunk_overlap",
             "status",
             "document_count",
             "error_message",
             "last_synced",
+            "sync_interval_minutes",
+            "next_sync_at",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "status", "document_count", "error_message", "last_synced", "created_at", "updated_at"]
+        read_only_fields = ["id", "status", "document_count", "error_message", "last_synced", "next_sync_at", "created_at", "updated_at"]
+
+    def validate_pagination(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Pagination must be an object.")
+        if value.get("type", "none") not in PAGINATION_TYPES:
+            raise serializers.ValidationError(
+                f"Pagination type must be one of: {', '.join(PAGINATION_TYPES)}."
+            )
+        for key in ("page_size", "max_pages"):
+            if key in value and (
+                isinstance(value[key], bool) or not isinstance(value[key], int) or value[key] < 1
+            ):
+                raise serializers.ValidationError(f"Pagination {key} must be a positive integer.")
+        return value
+
+    def validate_sync_interval_minutes(self, value):
+        if value is not None and value < 1:
+            raise serializers.ValidationError("Sync interval must be at least one minute.")
+        return value
+
+    def validate_hnsw_m(self, value):
+        if value is not None and not 4 <= value <= 128:
+            raise serializers.ValidationError("HNSW m must be between 4 and 128.")
+        return value
+
+    def validate_hnsw_ef_construct(self, value):
+        if value is not None and value < 4:
+            raise serializers.ValidationError("ef_construct must be at least 4.")
+        return value
+
+    def validate_search_ef(self, value):
+        if value is not None and value < 1:
+            raise serializers.ValidationError("Search ef must be at least 1.")
+        return value
 
     def validate(self, attrs):
         source_type = attrs.get(
@@ -41,8 +90,42 @@ class ApiSourceSerializer(serializers.ModelSerializer):
             if pdf_file and not str(pdf_file.name).lower().endswith(".pdf"):
                 raise serializers.ValidationError({"pdf_file": "Only PDF files are supported."})
 
+        chunk_size = attrs.get("chunk_size", self.instance.chunk_size if self.instance else None)
+        chunk_overlap = attrs.get("chunk_overlap", self.instance.chunk_overlap if self.instance else None)
+        if chunk_size is not None and chunk_overlap is not None and chunk_overlap >= chunk_size:
+            raise serializers.ValidationError({"chunk_overlap": "Overlap must be smaller than the chunk size."})
+
         return attrs
 
     def create(self, validated_data):
         validated_data["user"] = self.context["request"].user
         return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        interval = validated_data.get("sync_interval_minutes", instance.sync_interval_minutes)
+        if interval != instance.sync_interval_minutes:
+            # The scheduler gives unscheduled sources a first run within
+            # their new interval, instead of waiting out the old one.
+            validated_data["next_sync_at"] = None
+        return super().update(instance, validated_data)
+
+
+class IngestJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = IngestJob
+        fields = [
+            "id",
+            "source",
+            "kind",
+            "status",
+            "stage",
+            "progress",
+            "total",
+            "documents_ingested",
+            "error_message",
+            "duration_seconds",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
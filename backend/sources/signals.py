@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after ingest_source successfully rebuilds or re-syncs a source.
+# Receivers get ``source`` (the ApiSource instance).
+source_ingested = Signal()
@@ -0,0 +1,240 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from sources.api_fetch import ApiFetcher
+
+
+class FakeResponse:
+    def __init__(self, body=None, status_code=200, headers=None, links=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.links = links or {}
+        self.closed = False
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    """Routes GETs to ``handler(url, params, headers)`` and records them."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, timeout=None, stream=False):
+        with self._lock:
+            self.calls.append((url, dict(params or {}), dict(headers or {})))
+        return self.handler(url, params or {}, headers or {})
+
+
+ITEMS = [{"id": i} for i in range(250)]
+
+
+def offset_api(url, params, headers):
+    start, limit = params["skip"], params["limit"]
+    return FakeResponse({"products": ITEMS[start : start + limit], "total": len(ITEMS)})
+
+
+@override_settings(API_FETCH_REQUESTS_PER_SECOND=0, API_FETCH_CONCURRENCY=3)
+class ApiFetcherPaginationTests(SimpleTestCase):
+    def fetch(self, handler, **kwargs):
+        session = FakeSession(handler)
+        with mock.patch("sources.api_fetch.get_session", return_value=session):
+            fetcher = ApiFetcher("https://api.test/items", **kwargs)
+            items = list(fetcher)
+        return items, session, fetcher
+
+    def test_unpaginated_reads_items_at_data_path(self):
+        items, session, _ = self.fetch(
+            lambda url, params, headers: FakeResponse({"data": {"rows": [{"id": 1}, {"id": 2}]}}),
+            data_path="data.rows",
+        )
+
+        self.assertEqual(items, [{"id": 1}, {"id": 2}])
+        self.assertEqual(len(session.calls), 1)
+
+    def test_offset_pages_until_a_short_page(self):
+        items, session, _ = self.fetch(
+            offset_api,
+            data_path="products",
+            pagination={"type": "offset", "offset_param": "skip", "limit_param": "limit", "page_size": 100},
+        )
+
+        self.assertEqual(items, ITEMS)
+        offsets = sorted(params["skip"] for _, params, _ in session.calls)
+        self.assertEqual(offsets[:3], [0, 100, 200])
+
+    def test_offset_stops_at_reported_total(self):
+        def exact_api(url, params, headers):
+            start = params["skip"]
+            # Full pages forever: only the total tells where the data ends.
+            return FakeResponse({"products": [{"id": start + i} for i in range(100)], "total": 200})
+
+        items, _, _ = self.fetch(
+            exact_api,
+            data_path="products",
+            pagination={
+                "type": "offset",
+                "offset_param": "skip",
+                "limit_param": "limit",
+                "page_size": 100,
+                "total_path": "total",
+            },
+        )
+
+        self.assertEqual([item["id"] for item in items], list(range(200)))
+
+    def test_page_numbers_start_at_start_page(self):
+        def page_api(url, params, headers):
+            page, size = params["page"], params["per_page"]
+            start = (page - 1) * size
+            return FakeResponse(ITEMS[start : start + size])
+
+        items, session, _ = self.fetch(
+            page_api,
+            pagination={"type": "page", "page_param": "page", "size_param": "per_page", "page_size": 100},
+        )
+
+        self.assertEqual(items, ITEMS)
+        self.assertEqual(min(params["page"] for _, params, _ in session.calls), 1)
+
+    def test_max_pages_caps_the_fetch(self):
+        items, _, _ = self.fetch(
+            offset_api,
+            data_path="products",
+            pagination={"type": "offset", "offset_param": "skip", "limit_param": "limit", "page_size": 100, "max_pages": 2},
+        )
+
+        self.assertEqual(items, ITEMS[:200])
+
+    def test_cursor_is_sent_back_until_empty(self):
+        pages = {None: ([1, 2], "c1"), "c1": ([3, 4], "c2"), "c2": ([5], None)}
+
+        def cursor_api(url, params, headers):
+            ids, next_cursor = pages[params.get("after")]
+            return FakeResponse({"items": [{"id": i} for i in ids], "meta": {"next": next_cursor}})
+
+        items, session, _ = self.fetch(
+            cursor_api,
+            data_path="items",
+            pagination={"type": "cursor", "cursor_param": "after", "cursor_path": "meta.next"},
+        )
+
+        self.assertEqual([item["id"] for item in items], [1, 2, 3, 4, 5])
+        self.assertEqual(len(session.calls), 3)
+
+    def test_next_link_from_body(self):
+        pages = {
+            "https://api.test/items": ([1, 2], "https://api.test/items?p=2"),
+            "https://api.test/items?p=2": ([3], None),
+        }
+
+        def link_api(url, params, headers):
+            ids, next_url = pages[url]
+            return FakeResponse({"results": [{"id": i} for i in ids], "next": next_url})
+
+        items, _, _ = self.fetch(
+            link_api,
+            data_path="results",
+            pagination={"type": "next_link", "next_path": "next"},
+        )
+
+        self.assertEqual([item["id"] for item in items], [1, 2, 3])
+
+    def test_next_link_from_link_header(self):
+        def link_api(url, params, headers):
+            if url == "https://api.test/items":
+                return FakeResponse([{"id": 1}], links={"next": {"url": "https://api.test/items?p=2"}})
+            return FakeResponse([{"id": 2}])
+
+        items, _, _ = self.fetch(link_api, pagination={"type": "next_link"})
+
+        self.assertEqual(items, [{"id": 1}, {"id": 2}])
+
+    def test_rejects_non_positive_page_size(self):
+        with self.assertRaises(ValueError):
+            ApiFetcher("https://api.test/items", pagination={"type": "offset", "page_size": 0})
+
+    def test_rejects_unknown_pagination_type(self):
+        with self.assertRaises(ValueError):
+            ApiFetcher("https://api.test/items", pagination={"type": "scroll"})
+
+
+@override_settings(API_FETCH_REQUESTS_PER_SECOND=0)
+class ApiFetcherConditionalTests(SimpleTestCase):
+    state = {"etag": '"v1"', "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+    def test_unpaginated_probe_reports_not_modified(self):
+        response = FakeResponse(status_code=304)
+        session = FakeSession(lambda url, params, headers: response)
+
+        with mock.patch("sources.api_fetch.get_session", return_value=session):
+            fetcher = ApiFetcher("https://api.test/items", state=self.state)
+            self.assertFalse(fetcher.probe())
+
+        headers = session.calls[0][2]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], self.state["last_modified"])
+        self.assertTrue(response.closed)
+
+    def test_probe_response_is_reused_as_first_page(self):
+        session = FakeSession(
+            lambda url, params, headers: FakeResponse([{"id": 1}], headers={"ETag": '"v2"'})
+        )
+
+        with mock.patch("sources.api_fetch.get_session", return_value=session):
+            fetcher = ApiFetcher("https://api.test/items", state=self.state)
+            self.assertTrue(fetcher.probe())
+            items = list(fetcher)
+
+        self.assertEqual(items, [{"id": 1}])
+        self.assertEqual(len(session.calls), 1)
+        self.assertEqual(fetcher.new_state()["etag"], '"v2"')
+
+    def test_paginated_sources_never_send_validators(self):
+        session = FakeSession(offset_api)
+
+        with mock.patch("sources.api_fetch.get_session", return_value=session):
+            fetcher = ApiFetcher(
+                "https://api.test/items",
+                data_path="products",
+                pagination={"type": "offset", "offset_param": "skip", "limit_param": "limit", "page_size": 100},
+                state=self.state,
+            )
+            self.assertTrue(fetcher.probe())
+            items = list(fetcher)
+
+        self.assertEqual(items, ITEMS)
+        for _, _, headers in session.calls:
+            self.assertNotIn("If-None-Match", headers)
+            self.assertNotIn("If-Modified-Since", headers)
+        self.assertEqual(fetcher.new_state()["etag"], "")
+
+    def test_since_param_sends_the_saved_watermark(self):
+        session = FakeSession(
+            lambda url, params, headers: FakeResponse([{"id": 1, "updated_at": "2024-02-01"}])
+        )
+
+        with mock.patch("sources.api_fetch.get_session", return_value=session):
+            fetcher = ApiFetcher(
+                "https://api.test/items",
+                since_param="updated_since",
+                since_field="updated_at",
+                state={"since": "2024-01-01"},
+            )
+            list(fetcher)
+
+        self.assertTrue(fetcher.is_delta)
+        self.assertEqual(session.calls[0][1]["updated_since"], "2024-01-01")
+        self.assertEqual(fetcher.new_state()["since"], "2024-02-01")
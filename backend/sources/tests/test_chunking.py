@@ -0,0 +1,116 @@
+import re
+from unittest import TestCase
+
+from sources.chunking import Chunker
+
+
+class WordTokenizer:
+    """Stand-in for a Hugging Face fast tokenizer: one token per word."""
+
+    def __call__(self, text, add_special_tokens=False, return_offsets_mapping=False):
+        spans = [m.span() for m in re.finditer(r"\S+", text)]
+        encoded = {"input_ids": list(range(len(spans)))}
+        if return_offsets_mapping:
+            encoded["offset_mapping"] = spans
+        return encoded
+
+
+def words(text: str) -> int:
+    return len(text.split())
+
+
+class ChunkerConfigTests(TestCase):
+    def test_rejects_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            Chunker("paragraph", 100, 10)
+
+    def test_token_strategies_need_a_tokenizer(self):
+        with self.assertRaises(ValueError):
+            Chunker("token", 100, 10)
+
+    def test_overlap_must_be_smaller_than_size(self):
+        with self.assertRaises(ValueError):
+            Chunker("char", 10, 10)
+        with self.assertRaises(ValueError):
+            Chunker("char", 0, 0)
+
+    def test_blank_text_has_no_chunks(self):
+        self.assertEqual(Chunker("char", 10, 2).split("  \n "), [])
+        self.assertEqual(Chunker("recursive", 10, 2, WordTokenizer()).split(""), [])
+
+
+class CharChunkTests(TestCase):
+    def test_windows_overlap_by_the_configured_characters(self):
+        text = "abcdefghijklmnopqrstuvwxy"
+        chunks = Chunker("char", 10, 3).split(text)
+
+        self.assertEqual(chunks, ["abcdefghij", "hijklmnopq", "opqrstuvwx", "vwxy"])
+
+    def test_short_text_is_one_chunk(self):
+        self.assertEqual(Chunker("char", 100, 10).split("short text"), ["short text"])
+
+
+class TokenChunkTests(TestCase):
+    def setUp(self):
+        self.text = " ".join(f"w{i}" for i in range(10))
+
+    def test_windows_respect_size_and_overlap(self):
+        chunks = Chunker("token", 4, 1, WordTokenizer()).split(self.text)
+
+        self.assertEqual(chunks, ["w0 w1 w2 w3", "w3 w4 w5 w6", "w6 w7 w8 w9"])
+
+    def test_windows_are_cut_from_the_original_text(self):
+        text = "alpha,  beta\ngamma delta"
+        chunks = Chunker("token", 2, 0, WordTokenizer()).split(text)
+
+        self.assertEqual(chunks, ["alpha,  beta", "gamma delta"])
+
+
+class SentenceChunkTests(TestCase):
+    def test_packs_whole_sentences_up_to_the_limit(self):
+        text = "One two three. Four five. Six seven eight. Nine."
+        chunks = Chunker("sentence", 5, 0, WordTokenizer()).split(text)
+
+        self.assertEqual(chunks, ["One two three. Four five.", "Six seven eight. Nine."])
+
+    def test_overlap_repeats_trailing_sentences(self):
+        text = "A b. C d. E f. G h."
+        chunks = Chunker("sentence", 4, 2, WordTokenizer()).split(text)
+
+        self.assertEqual(chunks, ["A b. C d.", "C d. E f.", "E f. G h."])
+
+    def test_oversized_sentence_is_split_on_tokens(self):
+        text = " ".join(f"w{i}" for i in range(12)) + "."
+        chunks = Chunker("sentence", 5, 0, WordTokenizer()).split(text)
+
+        self.assertTrue(all(words(c) <= 5 for c in chunks))
+        self.assertEqual(" ".join(chunks).split(), text.split())
+
+
+class RecursiveChunkTests(TestCase):
+    def test_keeps_paragraphs_whole_when_they_fit(self):
+        text = "Para one has five words.\n\nPara two has five words."
+        chunks = Chunker("recursive", 5, 0, WordTokenizer()).split(text)
+
+        self.assertEqual(chunks, ["Para one has five words.", "Para two has five words."])
+
+    def test_packs_small_paragraphs_with_their_separator(self):
+        text = "First para.\n\nSecond para.\n\nThird para here now."
+        chunks = Chunker("recursive", 4, 0, WordTokenizer()).split(text)
+
+        self.assertEqual(chunks, ["First para.\n\nSecond para.", "Third para here now."])
+
+    def test_long_paragraph_falls_back_to_lines_then_sentences(self):
+        text = "Line one is here.\nLine two. Has two sentences here."
+        chunks = Chunker("recursive", 4, 0, WordTokenizer()).split(text)
+
+        self.assertEqual(chunks, ["Line one is here.", "Line two.", "Has two sentences here."])
+
+    def test_no_chunk_exceeds_the_token_limit(self):
+        text = "\n\n".join(
+            " ".join(f"p{p}s{s}w{w}" for w in range(7)) + "." for p in range(3) for s in range(3)
+        )
+        chunks = Chunker("recursive", 10, 3, WordTokenizer()).split(text)
+
+        self.assertTrue(chunks)
+        self.assertTrue(all(words(c) <= 10 for c in chunks))
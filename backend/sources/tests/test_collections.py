@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from sources import rag_service
+from sources.rag_service import _drop_old_versions, _swap_alias, collection_exists
+
+
+class FakeQdrant:
+    """Just enough of QdrantClient for alias bookkeeping."""
+
+    def __init__(self, collections=(), aliases=None):
+        self.collections = set(collections)
+        self.aliases = dict(aliases or {})
+        self.alias_updates = []
+
+    def get_aliases(self):
+        return SimpleNamespace(
+            aliases=[
+                SimpleNamespace(alias_name=alias, collection_name=target)
+                for alias, target in self.aliases.items()
+            ]
+        )
+
+    def get_collections(self):
+        return SimpleNamespace(collections=[SimpleNamespace(name=name) for name in sorted(self.collections)])
+
+    def collection_exists(self, name):
+        return name in self.collections or name in self.aliases
+
+    def delete_collection(self, name):
+        self.collections.discard(name)
+
+    def update_collection_aliases(self, change_aliases_operations):
+        self.alias_updates.append(change_aliases_operations)
+        for op in change_aliases_operations:
+            if getattr(op, "delete_alias", None):
+                del self.aliases[op.delete_alias.alias_name]
+            else:
+                self.aliases[op.create_alias.alias_name] = op.create_alias.collection_name
+
+
+class SwapAliasTests(SimpleTestCase):
+    def setUp(self):
+        rag_service._known_collections.clear()
+
+    def test_creates_a_missing_alias(self):
+        client = FakeQdrant(collections=["source_1_v1"])
+
+        _swap_alias(client, "source_1", "source_1_v1")
+
+        self.assertEqual(client.aliases, {"source_1": "source_1_v1"})
+        self.assertEqual(len(client.alias_updates), 1)
+
+    def test_moves_an_existing_alias_in_one_update(self):
+        client = FakeQdrant(
+            collections=["source_1_v1", "source_1_v2"],
+            aliases={"source_1": "source_1_v1"},
+        )
+
+        _swap_alias(client, "source_1", "source_1_v2")
+
+        self.assertEqual(client.aliases, {"source_1": "source_1_v2"})
+        # Delete and create go in one request, so the alias never dangles.
+        self.assertEqual(len(client.alias_updates), 1)
+        self.assertEqual(len(client.alias_updates[0]), 2)
+
+    def test_replaces_a_legacy_collection_named_like_the_alias(self):
+        client = FakeQdrant(collections=["source_1", "source_1_v2"])
+
+        _swap_alias(client, "source_1", "source_1_v2")
+
+        self.assertNotIn("source_1", client.collections)
+        self.assertEqual(client.aliases, {"source_1": "source_1_v2"})
+
+    def test_alias_is_remembered_as_existing(self):
+        client = FakeQdrant(collections=["source_1_v1"])
+        _swap_alias(client, "source_1", "source_1_v1")
+
+        client.aliases.clear()
+
+        self.assertTrue(collection_exists(client, "source_1"))
+
+
+class DropOldVersionsTests(SimpleTestCase):
+    def test_keeps_the_live_version_and_other_sources(self):
+        client = FakeQdrant(collections=["source_1_v1", "source_1_v2", "source_1_v3", "source_12_v1"])
+
+        _drop_old_versions(client, "source_1", keep="source_1_v3")
+
+        self.assertEqual(client.collections, {"source_1_v3", "source_12_v1"})
@@ -0,0 +1,103 @@
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+
+from sources.jobs import JobConflict, claim_next_job, enqueue_ingest
+from sources.models import ApiSource, IngestJob
+
+
+def make_source(user, name="Products"):
+    return ApiSource.objects.create(user=user, name=name, api_url="https://api.test/items")
+
+
+class EnqueueIngestTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("alice", password="secret")
+        self.source = make_source(self.user)
+
+    def test_creates_a_queued_job(self):
+        job = enqueue_ingest(self.source, kind="sync")
+
+        self.assertEqual(job.status, "queued")
+        self.assertEqual(job.kind, "sync")
+        self.assertEqual(job.user, self.user)
+
+    def test_reuses_the_active_job(self):
+        first = enqueue_ingest(self.source)
+        second = enqueue_ingest(self.source)
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(IngestJob.objects.count(), 1)
+
+    def test_sync_request_reuses_a_queued_ingest(self):
+        ingest = enqueue_ingest(self.source)
+
+        job = enqueue_ingest(self.source, kind="sync")
+
+        self.assertEqual(job.pk, ingest.pk)
+        self.assertEqual(job.kind, "ingest")
+
+    def test_ingest_request_upgrades_a_queued_sync(self):
+        sync = enqueue_ingest(self.source, kind="sync")
+
+        job = enqueue_ingest(self.source, kind="ingest")
+
+        self.assertEqual(job.pk, sync.pk)
+        self.assertEqual(job.kind, "ingest")
+        self.assertEqual(IngestJob.objects.get(pk=sync.pk).kind, "ingest")
+
+    def test_ingest_request_conflicts_with_a_running_sync(self):
+        sync = enqueue_ingest(self.source, kind="sync")
+        IngestJob.objects.filter(pk=sync.pk).update(status="running")
+
+        with self.assertRaises(JobConflict) as raised:
+            enqueue_ingest(self.source, kind="ingest")
+
+        self.assertEqual(raised.exception.job.pk, sync.pk)
+        self.assertEqual(IngestJob.objects.get(pk=sync.pk).kind, "sync")
+
+    def test_finished_jobs_do_not_block_a_new_one(self):
+        old = enqueue_ingest(self.source)
+        IngestJob.objects.filter(pk=old.pk).update(status="succeeded")
+
+        job = enqueue_ingest(self.source)
+
+        self.assertNotEqual(job.pk, old.pk)
+
+    def test_database_allows_one_active_job_per_source(self):
+        enqueue_ingest(self.source)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            IngestJob.objects.create(source=self.source, user=self.user)
+
+
+@override_settings(INGEST_MAX_JOBS_PER_USER=1)
+class ClaimNextJobTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user("alice", password="secret")
+        self.bob = User.objects.create_user("bob", password="secret")
+
+    def test_claims_the_oldest_queued_job(self):
+        first = enqueue_ingest(make_source(self.alice, "A"))
+        enqueue_ingest(make_source(self.bob, "B"))
+
+        job = claim_next_job("worker-1")
+
+        self.assertEqual(job.pk, first.pk)
+        self.assertEqual(job.status, "running")
+        self.assertEqual(job.worker_id, "worker-1")
+        self.assertIsNotNone(job.started_at)
+
+    def test_respects_the_per_user_limit(self):
+        enqueue_ingest(make_source(self.alice, "A1"))
+        enqueue_ingest(make_source(self.alice, "A2"))
+        bob_job = enqueue_ingest(make_source(self.bob, "B"))
+
+        claim_next_job("worker-1")
+        job = claim_next_job("worker-2")
+
+        self.assertEqual(job.pk, bob_job.pk)
+        self.assertIsNone(claim_next_job("worker-3"))
+
+    def test_returns_none_when_queue_is_empty(self):
+        self.assertIsNone(claim_next_job("worker-1"))
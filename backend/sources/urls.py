@@ -6,4 +6,7 @@ urlpatterns = [
     path("<int:pk>/", views.source_detail, name="source-detail"),
     path("<int:pk>/ingest/", views.source_ingest, name="source-ingest"),
     path("<int:pk>/sync/", views.source_sync, name="source-sync"),
+    path("<int:pk>/jobs/", views.source_jobs, name="source-jobs"),
+    path("jobs/<int:job_id>/", views.job_detail, name="job-detail"),
+    path("cache-stats/", views.cache_stats, name="cache-stats"),
 ]
@@ -1,13 +1,14 @@
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.decorators import parser_classes
 
-from .models import ApiSource
-from .serializers import ApiSourceSerializer
-from .rag_service import ingest_source, get_qdrant_client
+from .models import ApiSource, IngestJob
+from .serializers import ApiSourceSerializer, IngestJobSerializer
+from .rag_service import delete_source_collection, get_embedding_cache, get_query_cache
+from .jobs import JobConflict, enqueue_ingest
 
 
 # =========================================================
@@ -61,16 +62,7 @@ def source_detail(request, pk):
 
     elif request.method == "DELETE":
         try:
-            client = get_qdrant_client()
-            collection_name = source.collection_name
-
-            # Get all collections
-            collections = client.get_collections().collections
-            collection_names = [c.name for c in collections]
-
-            # Delete if exists
-            if collection_name in collection_names:
-                client.delete_collection(collection_name)
+            delete_source_collection(source)
 
         except Exception as e:
             return Response(
@@ -95,7 +87,7 @@ def source_detail(request, pk):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def source_ingest(request, pk):
-    """Trigger ingestion pipeline."""
+    """Queue the ingestion pipeline and return the job."""
 
     try:
         source = ApiSource.objects.get(pk=pk, user=request.user)
@@ -106,17 +98,14 @@ def source_ingest(request, pk):
         )
 
     try:
-        count = ingest_source(source)
+        job = enqueue_ingest(source, kind="ingest")
+    except JobConflict as e:
         return Response(
-            {"status": "ok", "documents_ingested": count},
-            status=status.HTTP_200_OK
-        )
-
-    except Exception as e:
-        return Response(
-            {"error": str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            {"error": "A sync of this source is running; retry the ingest when it finishes.",
+             "job": IngestJobSerializer(e.job).data},
+            status=status.HTTP_409_CONFLICT,
         )
+    return Response(IngestJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
 
 # =========================================================
@@ -126,7 +115,7 @@ def source_ingest(request, pk):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def source_sync(request, pk):
-    """Re-run ingestion pipeline."""
+    """Queue a re-run of the ingestion pipeline and return the job."""
 
     try:
         source = ApiSource.objects.get(pk=pk, user=request.user)
@@ -136,15 +125,63 @@ def source_sync(request, pk):
             status=status.HTTP_404_NOT_FOUND
         )
 
+    job = enqueue_ingest(source, kind="sync")
+    return Response(IngestJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+# =========================================================
+# INGEST JOBS
+# =========================================================
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def source_jobs(request, pk):
+    """List recent ingestion jobs for a source."""
+
     try:
-        count = ingest_source(source)
+        source = ApiSource.objects.get(pk=pk, user=request.user)
+    except ApiSource.DoesNotExist:
         return Response(
-            {"status": "ok", "documents_ingested": count},
-            status=status.HTTP_200_OK
+            {"error": "Source not found"},
+            status=status.HTTP_404_NOT_FOUND
         )
 
-    except Exception as e:
+    jobs = source.ingest_jobs.all().order_by("-created_at")[:20]
+    serializer = IngestJobSerializer(jobs, many=True)
+    return Response(serializer.data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def job_detail(request, job_id):
+    """Return status and progress of an ingestion job."""
+
+    try:
+        job = IngestJob.objects.get(pk=job_id, user=request.user)
+    except IngestJob.DoesNotExist:
         return Response(
-            {"error": str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            {"error": "Job not found"},
+            status=status.HTTP_404_NOT_FOUND
         )
+
+    serializer = IngestJobSerializer(job)
+    return Response(serializer.data)
+
+
+# =========================================================
+# CACHE METRICS
+# =========================================================
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """Hit/miss counters for this process's embedding caches."""
+
+    embedding_cache = get_embedding_cache()
+
+    return Response(
+        {
+            "query_vectors": get_query_cache().stats(),
+            "embeddings": embedding_cache.stats() if embedding_cache is not None else None,
+        }
+    )
@@ -1,20 +1,43 @@
+import os
+import requests
 import torch
+from dotenv import load_dotenv
 from sentence_transformers import SentenceTransformer
 
+load_dotenv()
+
 torch.set_num_threads(1)
 
-embedder = SentenceTransformer(
-    "all-MiniLM-L6-v2",
-    device="cpu"
-)
+# When set, embeddings come from the shared embedding server
+# (`python backend/manage.py embed_server`) and no local model is loaded.
+EMBED_SERVER_URL = os.getenv("EMBED_SERVER_URL", "").rstrip("/")
 
-embedder.encode(["warmup"], show_progress_bar=False)
+_session = requests.Session()
+_embedder = None
 
 
+def get_embedder() -> SentenceTransformer:
+    global _embedder
+    if _embedder is None:
+        _embedder = SentenceTransformer(
+            "all-MiniLM-L6-v2",
+            device="cpu"
+        )
+        _embedder.encode(["warmup"], show_progress_bar=False)
+    return _embedder
 
 
 def embed_texts(texts: list[str]) -> list[list[float]]:
-    embeddings = embedder.encode(
+    if EMBED_SERVER_URL:
+        response = _session.post(
+            f"{EMBED_SERVER_URL}/embed",
+            json={"texts": texts},
+            timeout=60,
+        )
+        response.raise_for_status()
+        return response.json()["vectors"]
+
+    embeddings = get_embedder().encode(
         texts,
         convert_to_numpy=True,
         normalize_embeddings=True,
@@ -1,7 +1,14 @@
+import os
+import sys
 from sentence_transformers import SentenceTransformer
 from uuid import uuid5, NAMESPACE_URL
 
+# The embedding cache is shared with the Django backend; it has no Django
+# dependencies, so import it from there rather than keeping a copy.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
 from api_source import fetch_api_data
+from sources.embedding_cache import EmbeddingCache, encode_with_cache
 from normalize import normalize_api_data
 from vector_db import QdrantStorage
 
@@ -18,6 +25,10 @@ embedder = SentenceTransformer(EMBED_MODEL_NAME)
 # Warm-up
 embedder.encode(["warmup"], show_progress_bar=False)
 
+# On-disk cache keyed by (model, text hash); unchanged items skip encoding.
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "embedding_cache.sqlite3")
+cache = EmbeddingCache(EMBED_CACHE_PATH, model_name=EMBED_MODEL_NAME) if EMBED_CACHE_PATH else None
+
 # =========================================================
 # MAIN PIPELINE
 # =========================================================
@@ -53,12 +64,9 @@ def embed_and_store():
     ]
 
     print("\n[3/4] Generating embeddings...")
-    vectors = embedder.encode(
-        texts,
-        convert_to_numpy=True,
-        normalize_embeddings=True,
-        show_progress_bar=True,
-    )
+    vectors = encode_with_cache(embedder, cache, texts)
+    if cache is not None:
+        print(f"Embedding cache: {cache.stats()}")
 
     print("\n[4/4] Upserting vectors into Qdrant...")
     store = QdrantStorage()
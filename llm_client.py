@@ -0,0 +1,35 @@
+import os
+import sys
+from dotenv import load_dotenv
+
+# The client itself lives in the Django backend (it has no Django
+# dependencies); this module only reads the scripts' configuration.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from sources.llm_client import get_llm_client as _shared_llm_client
+
+load_dotenv()
+
+# ---------------- LLM CONFIG (Groq, OpenAI-compatible) ---------------- #
+
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://api.groq.com/openai/v1")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "20"))
+LLM_KEEPALIVE_SECONDS = float(os.getenv("LLM_KEEPALIVE_SECONDS", "60"))
+
+
+def get_llm_client():
+    """
+    Process-wide client with a keep-alive connection pool.
+
+    Point LLM_BASE_URL at a local OpenAI-compatible server to test without Groq.
+    """
+    return _shared_llm_client(
+        api_key=os.getenv("GROQ_API_KEY"),
+        base_url=LLM_BASE_URL,
+        timeout=LLM_TIMEOUT,
+        max_retries=LLM_MAX_RETRIES,
+        pool_size=LLM_POOL_SIZE,
+        keepalive_expiry=LLM_KEEPALIVE_SECONDS,
+    )
@@ -1,10 +1,9 @@
-import os
 from fastapi import FastAPI
 from pydantic import BaseModel
 from dotenv import load_dotenv
-from openai import OpenAI
 
 from data_loader import embed_texts
+from llm_client import get_llm_client
 from vector_db import QdrantStorage
 
 load_dotenv()
@@ -53,12 +52,7 @@ async def query_rag(req: QueryRequest):
     context = "\n\n".join(contexts)
 
     # 3️⃣ Call Groq (OpenAI-compatible client)
-    client = OpenAI(
-        api_key=os.getenv("GROQ_API_KEY"),
-        base_url="https://api.groq.com/openai/v1",
-    )
-
-    completion = client.chat.completions.create(
+    completion = get_llm_client().chat.completions.create(
         model="llama-3.3-70b-versatile",
         messages=[
             {
@@ -1,27 +1,18 @@
 import os
 from dotenv import load_dotenv
-from sentence_transformers import SentenceTransformer
 
+from data_loader import embed_texts
+from llm_client import get_llm_client
 from vector_db import QdrantStorage
 
 load_dotenv()
 
-# ---------------- EMBEDDING MODEL ---------------- #
-
-EMBED_MODEL_NAME = "all-MiniLM-L6-v2"
-EMBED_DIM = 384
-
-embedder = SentenceTransformer(EMBED_MODEL_NAME)
-
 # ---------------- LLM CONFIG (Groq) ---------------- #
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
     raise RuntimeError("GROQ_API_KEY not set in .env")
 
-# Groq is OpenAI-compatible
-GROQ_BASE_URL = "https://api.groq.com/openai/v1"
-
 # ---------------- RAG QUERY ---------------- #
 
 def rag_query(question: str, top_k: int = 5) -> dict:
@@ -34,11 +25,7 @@ def rag_query(question: str, top_k: int = 5) -> dict:
     """
 
     # 1️⃣ Embed the question
-    query_vector = embedder.encode(
-        [question],
-        convert_to_numpy=True,
-        normalize_embeddings=True,
-    )[0]
+    query_vector = embed_texts([question])[0]
 
     # 2️⃣ Search Qdrant
     store = QdrantStorage()
@@ -72,14 +59,7 @@ Answer clearly and concisely.
 """
 
     # 5️⃣ Call Groq (OpenAI-compatible API)
-    from openai import OpenAI
-
-    client = OpenAI(
-        api_key=GROQ_API_KEY,
-        base_url=GROQ_BASE_URL,
-    )
-
-    response = client.chat.completions.create(
+    response = get_llm_client().chat.completions.create(
         model="llama-3.3-70b-versatile",
         messages=[
             {"role": "system", "content": "You answer using only the given context."},